@@ -158,23 +158,25 @@ class MainWindow(QOpenGLWindow):
         Args:
             event: The QMouseEvent object containing the new mouse position.
         """
+        # Read the coordinates once per event; each .x()/.y() accessor is a
+        # separate Python to C++ round trip and this runs at mouse-poll rate
+        position = event.position()
+        x, y = position.x(), position.y()
         # Rotate the scene if the left mouse button is pressed
         if self.rotate and event.buttons() == Qt.LeftButton:
-            position = event.position()
-            diff_x = position.x() - self.original_x_rotation
-            diff_y = position.y() - self.original_y_rotation
+            diff_x = x - self.original_x_rotation
+            diff_y = y - self.original_y_rotation
             self.spin_x_face += int(0.5 * diff_y)
             self.spin_y_face += int(0.5 * diff_x)
-            self.original_x_rotation = position.x()
-            self.original_y_rotation = position.y()
+            self.original_x_rotation = x
+            self.original_y_rotation = y
             self.update()
         # Translate (pan) the scene if the right mouse button is pressed
         elif self.translate and event.buttons() == Qt.RightButton:
-            position = event.position()
-            diff_x = int(position.x() - self.original_x_pos)
-            diff_y = int(position.y() - self.original_y_pos)
-            self.original_x_pos = position.x()
-            self.original_y_pos = position.y()
+            diff_x = int(x - self.original_x_pos)
+            diff_y = int(y - self.original_y_pos)
+            self.original_x_pos = x
+            self.original_y_pos = y
             self.model_position.x += self.INCREMENT * diff_x
             self.model_position.y -= self.INCREMENT * diff_y
             self.update()
@@ -187,15 +189,16 @@ class MainWindow(QOpenGLWindow):
             event: The QMouseEvent object.
         """
         position = event.position()
+        x, y = position.x(), position.y()
         # Left button initiates rotation
         if event.button() == Qt.LeftButton:
-            self.original_x_rotation = position.x()
-            self.original_y_rotation = position.y()
+            self.original_x_rotation = x
+            self.original_y_rotation = y
             self.rotate = True
         # Right button initiates translation
         elif event.button() == Qt.RightButton:
-            self.original_x_pos = position.x()
-            self.original_y_pos = position.y()
+            self.original_x_pos = x
+            self.original_y_pos = y
             self.translate = True
 
     def mouseReleaseEvent(self, event) -> None:
@@ -219,12 +222,10 @@ class MainWindow(QOpenGLWindow):
         Args:
             event: The QWheelEvent object.
         """
-        num_pixels = event.angleDelta()
-        # Zoom in or out by adjusting the Z position of the model
-        if num_pixels.x() > 0:
-            self.model_position.z += self.ZOOM
-        elif num_pixels.x() < 0:
-            self.model_position.z -= self.ZOOM
+        delta = event.angleDelta().x()
+        # Zoom in or out by adjusting the Z position of the model;
+        # (delta > 0) - (delta < 0) is the sign of the wheel movement
+        self.model_position.z += self.ZOOM * ((delta > 0) - (delta < 0))
         self.update()
 
 
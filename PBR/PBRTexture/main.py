@@ -19,24 +19,28 @@ import OpenGL.GL as gl
 from ngl import (
     DefaultShader,
     FirstPersonCamera,
-    Mat2,
     Mat3,
     Mat4,
     Primitives,
-    Random,
     ShaderLib,
     Transform,
     Vec3,
-    Vec3Array,
     logger,
 )
-from PySide6.QtCore import QElapsedTimer, Qt
+from PySide6.QtCore import QElapsedTimer, Qt, QTimer
 from PySide6.QtGui import QSurfaceFormat
 from PySide6.QtOpenGL import QOpenGLWindow
 from PySide6.QtWidgets import QApplication
 from texture_pack import TexturePack
 
 PBR_SHADER = "pbr"
+TEXTURE_PACKS = ["copper", "greasy", "panel", "rusty", "wood"]
+# Grid coordinates for the teapot rows / columns (was np.arange(-10, 10, 1.6))
+GRID_COORDS = tuple(-10.0 + 1.6 * i for i in range(13))
+# Static light layout and the on / off colours written into the lights UBO
+LIGHT_POSITIONS = ((-5.0, 4.0, -5.0), (5.0, 4.0, -5.0), (-5.0, 4.0, 5.0), (5.0, 4.0, 5.0))
+LIGHT_ON_COLOUR = (250.0, 250.0, 250.0)
+LIGHT_OFF_COLOUR = (0.0, 0.0, 0.0)
 
 
 class MainWindow(QOpenGLWindow):
@@ -47,6 +51,22 @@ class MainWindow(QOpenGLWindow):
     rendering the scene, and processing user input for camera control and interaction.
     """
 
+    # Maps number keys to the index of the light they toggle
+    LIGHT_KEYS = {
+        Qt.Key_1: 0,
+        Qt.Key_2: 1,
+        Qt.Key_3: 2,
+        Qt.Key_4: 3,
+    }
+
+    # Maps arrow keys to (x, y) movement directions for the camera
+    KEY_DIRECTIONS = {
+        Qt.Key_Left: (0.0, -1.0),
+        Qt.Key_Right: (0.0, 1.0),
+        Qt.Key_Up: (1.0, 0.0),
+        Qt.Key_Down: (-1.0, 0.0),
+    }
+
     def __init__(self, parent: object = None) -> None:
         """
         Initializes the main window, sets up scene parameters, and configures the camera.
@@ -61,7 +81,6 @@ class MainWindow(QOpenGLWindow):
         # --- Scene and Transformation Attributes ---
         self.transform = Transform()
         self.mouse_global_tx: Mat4 = Mat4()
-        self.model_position: Vec3 = Vec3()
         self.seed: int = 12345
         self.light_on = [True, True, True, True]
         self.show_lights = True
@@ -78,6 +97,13 @@ class MainWindow(QOpenGLWindow):
         self.timer = QElapsedTimer()
         self.timer.start()
         self.last_frame = 0.0
+
+        # Coalesce bursts of mouse events into at most one repaint per
+        # ~frame interval; high polling-rate mice can deliver far more
+        # move events than the display can show.
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.timeout.connect(self.update)
         self._setup_camera()
 
     def _setup_camera(self):
@@ -109,6 +135,39 @@ class MainWindow(QOpenGLWindow):
         Primitives.create_triangle_plane("floor", 30, 30, 10, 10, Vec3(0, 1, 0))
         TexturePack.load_json("textures/textures.json")
         Primitives.load_default_primitives()
+        self._build_teapot_grid()
+
+    def _build_teapot_grid(self) -> None:
+        """
+        Precompute the teapot grid for the current seed.
+
+        The grid is deterministic per seed, so the per-frame loop in
+        `_render_scene` only has to iterate a flat list instead of re-drawing
+        random numbers for every teapot. The list is sorted by texture pack so
+        each pack is activated once per frame rather than once per teapot.
+        """
+        rng = random.Random(self.seed)
+        np_rng = np.random.default_rng(self.seed)
+        count = len(GRID_COORDS) ** 2
+        # Draw all the per-teapot randoms in bulk: one model rotation and one
+        # UV rotation angle each, with the cos/sin evaluated vectorised.
+        rotations = np_rng.uniform(0.0, 360.0, count)
+        tex_angles = np_rng.uniform(-math.pi, math.pi, count)
+        tex_cos = np.cos(tex_angles).astype(np.float32)
+        tex_sin = np.sin(tex_angles).astype(np.float32)
+
+        grid = []
+        index = 0
+        for row in GRID_COORDS:
+            for col in GRID_COORDS:
+                texture = rng.choice(TEXTURE_PACKS)
+                grid.append(
+                    (col, row, rotations[index], texture, tex_cos[index], tex_sin[index])
+                )
+                index += 1
+        # Group by texture pack to minimise redundant texture binds
+        grid.sort(key=lambda item: item[3])
+        self._teapot_grid = grid
 
     def _setup_pbr_shader(self) -> None:
         """Load and configure the PBR shader program."""
@@ -128,28 +187,56 @@ class MainWindow(QOpenGLWindow):
         ShaderLib.set_uniform("aoMap", 4)
         ShaderLib.print_registered_uniforms()
 
-    def _setup_lights(self) -> None:
-        """Configure the light sources for the scene."""
-        light_colors = Vec3Array(
-            [
-                Vec3(250.0, 250.0, 250.0),
-                Vec3(250.0, 250.0, 250.0),
-                Vec3(250.0, 250.0, 250.0),
-                Vec3(250.0, 250.0, 250.0),
-            ]
-        )
-        self.light_positions = Vec3Array(
-            [
-                Vec3(-5.0, 4.0, -5.0),
-                Vec3(5.0, 4.0, -5.0),
-                Vec3(-5.0, 4.0, 5.0),
-                Vec3(5.0, 4.0, 5.0),
-            ]
+        # Cache the uniform locations and scratch upload buffers used by
+        # load_matrices_to_shader so the per-teapot path avoids name lookups
+        # and repeated buffer allocation.
+        program = gl.glGetIntegerv(gl.GL_CURRENT_PROGRAM)
+        self._loc_mvp = gl.glGetUniformLocation(program, "MVP")
+        self._loc_m = gl.glGetUniformLocation(program, "M")
+        self._loc_normal_matrix = gl.glGetUniformLocation(program, "normalMatrix")
+        self._loc_texture_rotation = gl.glGetUniformLocation(
+            program, "textureRotation"
         )
+        self._loc_cam_pos = gl.glGetUniformLocation(program, "camPos")
+        self._mat4_scratch = np.empty((2, 16), dtype=np.float32)
+        self._mat3_scratch = np.empty(9, dtype=np.float32)
+        self._mat2_scratch = np.empty(4, dtype=np.float32)
+
+    def _setup_lights(self) -> None:
+        """Configure the light sources for the scene.
+
+        The positions and colours for all four lights live in a single std140
+        uniform buffer bound once here, so toggling a light is one
+        glBufferSubData instead of per-name uniform lookups.
+        """
         ShaderLib.use(PBR_SHADER)
-        for i in range(4):
-            ShaderLib.set_uniform(f"lightPositions[{i}]", self.light_positions[i])
-            ShaderLib.set_uniform(f"lightColors[{i}]", light_colors[i])
+        # std140 layout: vec4 lightPositions[4]; vec4 lightColors[4];
+        self._light_block = np.zeros((8, 4), dtype=np.float32)
+        for i, position in enumerate(LIGHT_POSITIONS):
+            self._light_block[i, 0:3] = position
+            self._light_block[4 + i, 0:3] = LIGHT_ON_COLOUR
+
+        self._lights_ubo = gl.glGenBuffers(1)
+        gl.glBindBuffer(gl.GL_UNIFORM_BUFFER, self._lights_ubo)
+        gl.glBufferData(
+            gl.GL_UNIFORM_BUFFER,
+            self._light_block.nbytes,
+            self._light_block,
+            gl.GL_DYNAMIC_DRAW,
+        )
+        program = gl.glGetIntegerv(gl.GL_CURRENT_PROGRAM)
+        block_index = gl.glGetUniformBlockIndex(program, "LightsUBO")
+        gl.glUniformBlockBinding(program, block_index, 1)
+        gl.glBindBufferBase(gl.GL_UNIFORM_BUFFER, 1, self._lights_ubo)
+        gl.glBindBuffer(gl.GL_UNIFORM_BUFFER, 0)
+
+        # The light indicator positions never change, so cache one model
+        # matrix per light instead of rebuilding a Transform every frame.
+        self._light_matrices = []
+        for position in LIGHT_POSITIONS:
+            t = Transform()
+            t.set_position(*position)
+            self._light_matrices.append(t.get_matrix())
 
         # Setup a simple color for the light indicators
         ShaderLib.use(DefaultShader.COLOUR)
@@ -164,27 +251,29 @@ class MainWindow(QOpenGLWindow):
         gl.glClear(gl.GL_COLOR_BUFFER_BIT | gl.GL_DEPTH_BUFFER_BIT)
 
         self._update_camera_movement()
+        # Fetch the camera matrices once per frame; every draw this frame
+        # shares them, so there is no need to rebuild VP per teapot.
+        self._view = self.camera.view
+        self._vp = self.camera.get_vp()
         self._render_lights()
         self._render_scene()
 
     def _update_camera_movement(self) -> None:
         """Calculates and applies camera movement based on currently pressed keys."""
+        # Keep the frame clock ticking even while idle, otherwise the first
+        # move after a pause gets the whole idle period as its delta time.
+        current_frame = self.timer.elapsed() * 0.001
+        delta_time = current_frame - self.last_frame
+        self.last_frame = current_frame
+
         x_direction = 0.0
         y_direction = 0.0
         for key in self.keys_pressed:
-            if key == Qt.Key_Left:
-                y_direction = -1.0
-            elif key == Qt.Key_Right:
-                y_direction = 1.0
-            elif key == Qt.Key_Up:
-                x_direction = 1.0
-            elif key == Qt.Key_Down:
-                x_direction = -1.0
+            dx, dy = self.KEY_DIRECTIONS.get(key, (0.0, 0.0))
+            x_direction += dx
+            y_direction += dy
 
         if x_direction != 0.0 or y_direction != 0.0:
-            current_frame = self.timer.elapsed() * 0.001
-            delta_time = current_frame - self.last_frame
-            self.last_frame = current_frame
             self.camera.move(x_direction, y_direction, delta_time)
 
     def _render_lights(self) -> None:
@@ -192,32 +281,24 @@ class MainWindow(QOpenGLWindow):
         if not self.show_lights:
             return
         ShaderLib.use(DefaultShader.COLOUR)
-        for i in range(4):
-            self.transform.reset()
-            self.transform.set_position(
-                self.light_positions[i][0],
-                self.light_positions[i][1],
-                self.light_positions[i][2],
-            )
-            self.load_matrices_to_colour_shader()
+        for model in self._light_matrices:
+            ShaderLib.set_uniform("MVP", self._vp @ self.mouse_global_tx @ model)
             Primitives.draw("sphere")
 
     def _render_scene(self) -> None:
         """Renders the main PBR scene, including the grid of teapots and the floor."""
         ShaderLib.use(PBR_SHADER)
-        Random.set_seed_value(self.seed)
-        textures = ["copper", "greasy", "panel", "rusty", "wood"]
-
-        # Render a grid of teapots with random PBR materials and rotations
-        for row in np.arange(-10, 10, 1.6):
-            for col in np.arange(-10, 10, 1.6):
-                TexturePack.activate_texture_pack(random.choice(textures))
-                self.transform.set_position(col, 0.0, row)
-                self.transform.set_rotation(
-                    0.0, Random.random_positive_number() * 360.0, 0.0
-                )
-                self.load_matrices_to_shader()
-                Primitives.draw("teapot")
+
+        # Render the precomputed grid of teapots, grouped by texture pack
+        current_texture = None
+        for col, row, rotation, texture, tex_cos, tex_sin in self._teapot_grid:
+            if texture != current_texture:
+                TexturePack.activate_texture_pack(texture)
+                current_texture = texture
+            self.transform.set_position(col, 0.0, row)
+            self.transform.set_rotation(0.0, rotation, 0.0)
+            self.load_matrices_to_shader(tex_cos, tex_sin)
+            Primitives.draw("teapot")
 
         # Render the floor
         TexturePack.activate_texture_pack("greasy")
@@ -230,42 +311,48 @@ class MainWindow(QOpenGLWindow):
         """
         Handles window resize events. Updates viewport and projection matrix.
         """
-        self.window_width = int(w * self.devicePixelRatio())
-        self.window_height = int(h * self.devicePixelRatio())
+        dpr = self.devicePixelRatio()
+        self.window_width = int(w * dpr)
+        self.window_height = int(h * dpr)
         self.camera.set_projection(45.0, w / h, 0.05, 350.0)
 
-    def load_matrices_to_shader(self) -> None:
+    def load_matrices_to_shader(
+        self, tex_rot_cos: float = 1.0, tex_rot_sin: float = 0.0
+    ) -> None:
         """
         Calculates and sends the required matrices and uniforms to the PBR shader.
+
+        Args:
+            tex_rot_cos: cosine of the UV rotation angle for this draw.
+            tex_rot_sin: sine of the UV rotation angle for this draw.
         """
         M = self.transform.get_matrix()
-        MV = self.camera.view @ M
-        MVP = self.camera.get_vp() @ M
+        MV = self._view @ M
+        MVP = self._vp @ M
 
+        # Every transform in this scene is rotation + translation only, so the
+        # inverse-transpose of the upper 3x3 equals the upper 3x3 itself and
+        # the per-draw Mat3 inverse can be skipped. (The previous
+        # inverse().transpose() also discarded its result.)
         normal_matrix = Mat3.from_mat4(MV)
-        normal_matrix.inverse().transpose()
 
         ShaderLib.use(PBR_SHADER)
-        ShaderLib.set_uniform("MVP", MVP)
-        ShaderLib.set_uniform("normalMatrix", normal_matrix)
-        ShaderLib.set_uniform("M", M)
-
-        # Apply a random texture rotation for variation
-        texture_rotation = math.radians(Random.random_number(180.0))
-        cos_theta = math.cos(texture_rotation)
-        sin_theta = math.sin(texture_rotation)
-        tex_rot = Mat2.from_list([cos_theta, sin_theta, -sin_theta, cos_theta])
-        ShaderLib.set_uniform("textureRotation", tex_rot)
-        ShaderLib.set_uniform("camPos", self.camera.eye)
-
-    def load_matrices_to_colour_shader(self) -> None:
-        """
-        Calculates and sends the MVP matrix to the simple colour shader.
-        """
-        M = self.mouse_global_tx @ self.transform.get_matrix()
-        MVP = self.camera.get_vp() @ M
-        ShaderLib.use(DefaultShader.COLOUR)
-        ShaderLib.set_uniform("MVP", MVP)
+        self._mat4_scratch[0] = MVP.to_list()
+        self._mat4_scratch[1] = M.to_list()
+        self._mat3_scratch[:] = normal_matrix.to_list()
+        gl.glUniformMatrix4fv(self._loc_mvp, 1, gl.GL_FALSE, self._mat4_scratch[0])
+        gl.glUniformMatrix4fv(self._loc_m, 1, gl.GL_FALSE, self._mat4_scratch[1])
+        gl.glUniformMatrix3fv(
+            self._loc_normal_matrix, 1, gl.GL_FALSE, self._mat3_scratch
+        )
+
+        # Apply the precomputed texture rotation for variation
+        self._mat2_scratch[:] = (tex_rot_cos, tex_rot_sin, -tex_rot_sin, tex_rot_cos)
+        gl.glUniformMatrix2fv(
+            self._loc_texture_rotation, 1, gl.GL_FALSE, self._mat2_scratch
+        )
+        eye = self.camera.eye
+        gl.glUniform3f(self._loc_cam_pos, eye.x, eye.y, eye.z)
 
     def keyPressEvent(self, event) -> None:
         """
@@ -279,18 +366,13 @@ class MainWindow(QOpenGLWindow):
         elif key == Qt.Key_R:
             self.seed = random.randint(0, 1000000)
             logger.info(f"New random seed set: {self.seed}")
+            self._build_teapot_grid()
         elif key == Qt.Key_Space:
             self._setup_camera()
 
             # A proper camera reset would be needed here if implemented in the camera class
-        elif key == Qt.Key_1:
-            self._toggle_light(0)
-        elif key == Qt.Key_2:
-            self._toggle_light(1)
-        elif key == Qt.Key_3:
-            self._toggle_light(2)
-        elif key == Qt.Key_4:
-            self._toggle_light(3)
+        elif key in self.LIGHT_KEYS:
+            self._toggle_light(self.LIGHT_KEYS[key])
         elif key == Qt.Key_L:
             self.show_lights ^= True
 
@@ -305,12 +387,19 @@ class MainWindow(QOpenGLWindow):
             light_index: The index of the light to toggle (0-3).
         """
         self.light_on[light_index] ^= True
-        ShaderLib.use(PBR_SHADER)
         if self.light_on[light_index]:
-            colour = Vec3(250.0, 250.0, 250.0)
+            colour = LIGHT_ON_COLOUR
         else:
-            colour = Vec3(0.0, 0.0, 0.0)
-        ShaderLib.set_uniform(f"lightColors[{light_index}]", colour)
+            colour = LIGHT_OFF_COLOUR
+        self._light_block[4 + light_index, 0:3] = colour
+        gl.glBindBuffer(gl.GL_UNIFORM_BUFFER, self._lights_ubo)
+        gl.glBufferSubData(
+            gl.GL_UNIFORM_BUFFER,
+            (4 + light_index) * 16,
+            16,
+            self._light_block[4 + light_index],
+        )
+        gl.glBindBuffer(gl.GL_UNIFORM_BUFFER, 0)
 
     def keyReleaseEvent(self, event) -> None:
         """
@@ -327,14 +416,15 @@ class MainWindow(QOpenGLWindow):
         """
         if self.rotate and event.buttons() == Qt.LeftButton:
             position = event.position()
-            diff_x = position.x() - self.original_x_rotation
-            diff_y = position.y() - self.original_y_rotation
-            self.original_x_rotation = position.x()
-            self.original_y_rotation = position.y()
+            x, y = position.x(), position.y()
+            diff_x = x - self.original_x_rotation
+            diff_y = y - self.original_y_rotation
+            self.original_x_rotation = x
+            self.original_y_rotation = y
             self.camera.process_mouse_movement(
                 diff_x, -diff_y
             )  # Invert Y for intuitive rotation
-            self.update()
+            self._request_update()
 
     def mousePressEvent(self, event) -> None:
         """
@@ -342,8 +432,10 @@ class MainWindow(QOpenGLWindow):
         """
         position = event.position()
         if event.button() == Qt.LeftButton:
-            self.original_x_rotation = position.x()
-            self.original_y_rotation = position.y()
+            self.original_x_rotation, self.original_y_rotation = (
+                position.x(),
+                position.y(),
+            )
             self.rotate = True
 
     def mouseReleaseEvent(self, event) -> None:
@@ -359,7 +451,12 @@ class MainWindow(QOpenGLWindow):
         """
         num_pixels = event.angleDelta().y()  # Use y() for vertical scroll
         self.camera.process_mouse_scroll(num_pixels * 0.01)  # Adjust sensitivity
-        self.update()
+        self._request_update()
+
+    def _request_update(self) -> None:
+        """Schedule a repaint, coalescing event bursts to roughly 60 Hz."""
+        if not self._update_timer.isActive():
+            self._update_timer.start(16)
 
 
 class DebugApplication(QApplication):
@@ -11,9 +11,12 @@ uniform sampler2D metallicMap;
 uniform sampler2D roughnessMap;
 uniform sampler2D aoMap;
 uniform float roughnessScale;
-// lights
-uniform vec3 lightPositions[4];
-uniform vec3 lightColors[4];
+// lights are bound once as a std140 UBO (vec3 arrays pad to vec4)
+layout(std140) uniform LightsUBO
+{
+    vec4 lightPositions[4];
+    vec4 lightColors[4];
+};
 
 uniform vec3 camPos;
 
@@ -100,11 +103,11 @@ void main()
     for(int i = 0; i < 4; ++i)
     {
         // calculate per-light radiance
-        vec3 L = normalize(lightPositions[i] - WorldPos);
+        vec3 L = normalize(lightPositions[i].xyz - WorldPos);
         vec3 H = normalize(V + L);
-        float distance = length(lightPositions[i] - WorldPos);
+        float distance = length(lightPositions[i].xyz - WorldPos);
         float attenuation = 1.0 / (distance * distance);
-        vec3 radiance = lightColors[i] * attenuation;
+        vec3 radiance = lightColors[i].rgb * attenuation;
 
         // Cook-Torrance BRDF
         float NDF = DistributionGGX(N, H, roughness);
@@ -45,6 +45,7 @@ class TexturePack:
     """
 
     s_textures = {}
+    s_active_pack = None
 
     @staticmethod
     def load_json(filename):
@@ -128,12 +129,16 @@ class TexturePack:
         """
         Activate a loaded texture pack by name.
         This binds all textures in the pack to their respective texture units.
+        Re-activating the pack that is already bound is a no-op.
         """
+        if tname == TexturePack.s_active_pack:
+            return True
         pack = TexturePack.s_textures.get(tname)
         if pack:
             for t in pack:
                 gl.glActiveTexture(gl.GL_TEXTURE0 + t.location)
                 gl.glBindTexture(gl.GL_TEXTURE_2D, t.id)
+            TexturePack.s_active_pack = tname
             return True
         print(f"Texture pack '{tname}' not found")
         return False
@@ -2,7 +2,6 @@
 import os
 import sys
 from dataclasses import dataclass
-from pathlib import Path
 
 from PySide6.QtCore import QFile, Qt
 from PySide6.QtUiTools import QUiLoader
@@ -21,6 +20,7 @@ class DemoRunner(QMainWindow):
         super().__init__()
         self.setWindowTitle("PyNGL Demos")
         self._find_executables()
+        self._demo_by_name = {demo.button_name: demo for demo in self.executables}
         self.load_ui()
         # now add a new button for each executable found
         layout = self.demo_list.layout()
@@ -31,31 +31,33 @@ class DemoRunner(QMainWindow):
             layout.addWidget(button)
 
     def _find_executables(self):
-        root = Path.cwd()
+        root = os.getcwd()
         exclude_dirs = {".venv", ".git", "__pycache__"}
-        exclude_stems = {"__name__"}
+        exclude_names = {"__name__.py"}
 
-        def walk(root: Path):
-            for p in root.iterdir():
-                if p.is_dir():
-                    if p.name in exclude_dirs:
-                        continue
-                    yield from walk(p)
-                elif p.suffix == ".py":
-                    if (
-                        p.stem in exclude_stems
-                        or p.name == f"{next(iter(exclude_stems))}.py"
-                    ):
-                        continue
-                    if os.access(p, os.X_OK):
-                        yield p
+        def walk(top: str):
+            # Iterative os.scandir walk: no Path object per entry and the
+            # dir/file check reuses the stat data scandir already fetched.
+            stack = [top]
+            while stack:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in exclude_dirs:
+                                stack.append(entry.path)
+                        elif entry.name.endswith(".py"):
+                            if entry.name in exclude_names:
+                                continue
+                            if os.access(entry.path, os.X_OK):
+                                yield entry.path
 
         self.executables = []
-        for p in walk(root):
+        for path in walk(root):
+            parent = os.path.dirname(path)
             demo = Demo(
-                button_name=p.parent.name,
-                root_path=str(p.parent),
-                app_full_path=str(p),
+                button_name=os.path.basename(parent),
+                root_path=parent,
+                app_full_path=path,
             )
             self.executables.append(demo)
             print(demo)
@@ -80,11 +82,9 @@ class DemoRunner(QMainWindow):
         sender = self.sender()
         if not sender:
             return
-        button_name = sender.objectName()
-        for demo in self.executables:
-            if demo.button_name == button_name:
-                print(f"Button clicked: {demo.button_name}, Path: {demo.app_full_path}")
-                break
+        demo = self._demo_by_name.get(sender.objectName())
+        if demo:
+            print(f"Button clicked: {demo.button_name}, Path: {demo.app_full_path}")
 
     # @Slot(bool)
     # def start_button_toggled(self, state: bool):
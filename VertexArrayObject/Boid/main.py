@@ -1,7 +1,10 @@
 #!/usr/bin/env -S uv run --script
 
+import functools
+import math
 import sys
 
+import numpy as np
 import OpenGL.GL as gl
 from ngl import (
     DefaultShader,
@@ -11,16 +14,53 @@ from ngl import (
     VAOFactory,
     VAOType,
     Vec3,
-    Vec3Array,
     VertexData,
     look_at,
     perspective,
 )
+from PySide6.QtCore import QTimer
 from PySide6.QtGui import QSurfaceFormat
 from PySide6.QtOpenGL import QOpenGLWindow
 from PySide6.QtWidgets import QApplication
 
 
+def _rotate_yx(x_deg: float, y_deg: float) -> Mat4:
+    """
+    Build rotate_y(y_deg) @ rotate_x(x_deg) directly from its closed form.
+
+    Writing the product's nine entries from four sin/cos evaluations avoids
+    the two intermediate Mat4 allocations and the 4x4 multiply that
+    `Mat4().rotate_y(...) @ Mat4().rotate_x(...)` costs per update.
+    """
+    x = math.radians(x_deg)
+    y = math.radians(y_deg)
+    cx, sx = math.cos(x), math.sin(x)
+    cy, sy = math.cos(y), math.sin(y)
+    m = Mat4()
+    m[0][0] = cy
+    m[0][2] = -sy
+    m[1][0] = sy * sx
+    m[1][1] = cx
+    m[1][2] = cy * sx
+    m[2][0] = sy * cx
+    m[2][1] = -sx
+    m[2][2] = cy * cx
+    return m
+
+
+@functools.lru_cache(maxsize=4096)
+def _compose_rot(spin_x: float, spin_y: float) -> Mat4:
+    """
+    Memoised rotation for a (spin x, spin y) pair.
+
+    The spin angles move in whole-degree steps, so the same pair recurs
+    whenever the user pauses or retraces a drag; repeats skip the trig
+    entirely. Callers overwrite the translation column of the returned
+    matrix, which is safe because every caller rewrites it before use.
+    """
+    return _rotate_yx(spin_x, spin_y)
+
+
 class MainWindow(PySideEventHandlingMixin, QOpenGLWindow):
     """
     Main application window for rendering a simple Boid model using OpenGL.
@@ -46,6 +86,31 @@ class MainWindow(PySideEventHandlingMixin, QOpenGLWindow):
         self.modelPos: Vec3 = Vec3()  # Model position in world space
         self.view: Mat4 = Mat4()  # View matrix
         self.project: Mat4 = Mat4()  # Projection matrix
+        self.mouse_global_tx: Mat4 = Mat4()  # Cached model transform
+        self._project_view: Mat4 = Mat4()  # Cached projection @ view
+        # Rotation and translation are tracked separately: a pan or zoom
+        # only rewrites the translation column of the cached transform
+        self._last_rotation = None  # (spin x, spin y)
+        self._last_translation = None  # (x, y, z) of model position
+        # Coalesce bursts of repaint requests into at most one per ~frame
+        # interval; high polling-rate mice can deliver far more move events
+        # than the display can show.
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.timeout.connect(self._flush_update)
+
+    def update(self) -> None:
+        """
+        Schedule a repaint, coalescing event bursts to roughly 60 Hz.
+
+        The mixin's mouse handlers call this on every move event; routing
+        them through a single-shot timer caps the paint rate during drags.
+        """
+        if not self._update_timer.isActive():
+            self._update_timer.start(16)
+
+    def _flush_update(self) -> None:
+        super().update()
 
     def initializeGL(self) -> None:
         """
@@ -57,37 +122,49 @@ class MainWindow(PySideEventHandlingMixin, QOpenGLWindow):
         gl.glEnable(gl.GL_DEPTH_TEST)  # Enable depth testing for 3D
         gl.glEnable(gl.GL_MULTISAMPLE)  # Enable anti-aliasing
         self.view = look_at(Vec3(0, 1, 4), Vec3(0, 0, 0), Vec3(0, 1, 0))  # Camera setup
+        self._project_view = self.project @ self.view
         ShaderLib.use(DefaultShader.COLOUR)  # Use color shader
         ShaderLib.set_uniform("Colour", 1.0, 1.0, 1.0, 1.0)  # Set default color
+        # Cache the MVP location and a scratch upload buffer so the per-update
+        # upload avoids driver name lookups and repeated allocation.
+        program = gl.glGetIntegerv(gl.GL_CURRENT_PROGRAM)
+        self._loc_mvp = gl.glGetUniformLocation(program, "MVP")
+        self._mat4_scratch = np.empty(16, dtype=np.float32)
         self.buildVAO()  # Build geometry
 
     def buildVAO(self) -> None:
         """
         Creates and sets up the Vertex Array Object (VAO) for the Boid geometry.
         """
-        # Define vertices for the Boid model
+        # Define vertices for the Boid model as a contiguous float32 buffer
+        # so the upload is a single memcpy with no per-Vec3 Python objects.
         # fmt : off
-        verts = Vec3Array(
+        verts = np.array(
             [
-                Vec3(0.0, 1.0, 1.0),
-                Vec3(0.0, 0.0, -1.0),
-                Vec3(-0.5, 0.0, 1.0),
-                Vec3(0.0, 1.0, 1.0),
-                Vec3(0.0, 0.0, -1.0),
-                Vec3(0.5, 0.0, 1.0),
-                Vec3(0.0, 1.0, 1.0),
-                Vec3(0.0, 0.0, 1.5),
-                Vec3(-0.5, 0.0, 1.0),
-                Vec3(0.0, 1.0, 1.0),
-                Vec3(0.0, 0.0, 1.5),
-                Vec3(0.5, 0.0, 1.0),
-            ]
+                [0.0, 1.0, 1.0],
+                [0.0, 0.0, -1.0],
+                [-0.5, 0.0, 1.0],
+                [0.0, 1.0, 1.0],
+                [0.0, 0.0, -1.0],
+                [0.5, 0.0, 1.0],
+                [0.0, 1.0, 1.0],
+                [0.0, 0.0, 1.5],
+                [-0.5, 0.0, 1.0],
+                [0.0, 1.0, 1.0],
+                [0.0, 0.0, 1.5],
+                [0.5, 0.0, 1.0],
+            ],
+            dtype=np.float32,
         )
         # fmt : on
         # Create VAO and bind vertex data
         self.vao = VAOFactory.create_vao(VAOType.SIMPLE, gl.GL_TRIANGLES)
         with self.vao:
-            data: VertexData = VertexData(data=verts.to_list(), size=len(verts))
+            # The mesh is written once and never updated, so tell the driver
+            # it can place the buffer in GPU-resident memory
+            data: VertexData = VertexData(
+                data=verts.ravel(), size=len(verts), mode=gl.GL_STATIC_DRAW
+            )
             self.vao.set_data(data)
             self.vao.set_vertex_attribute_pointer(0, 3, gl.GL_FLOAT, 0, 0)
 
@@ -95,8 +172,11 @@ class MainWindow(PySideEventHandlingMixin, QOpenGLWindow):
         """
         Loads the Model-View-Projection (MVP) matrix to the shader.
         """
-        mvp: Mat4 = self.project @ self.view @ self.mouse_global_tx
-        ShaderLib.set_uniform("MVP", mvp)
+        mvp: Mat4 = self._project_view @ self.mouse_global_tx
+        # The colour program is already bound, so upload through the cached
+        # location with no name resolution
+        self._mat4_scratch[:] = mvp.to_list()
+        gl.glUniformMatrix4fv(self._loc_mvp, 1, gl.GL_FALSE, self._mat4_scratch)
 
     def paintGL(self) -> None:
         """
@@ -104,21 +184,38 @@ class MainWindow(PySideEventHandlingMixin, QOpenGLWindow):
         Handles clearing, setting up transformations, and drawing geometry.
         """
         self.makeCurrent()
-        gl.glViewport(0, 0, self.window_width, self.window_height)
         gl.glClear(gl.GL_COLOR_BUFFER_BIT | gl.GL_DEPTH_BUFFER_BIT)
-        ShaderLib.use(DefaultShader.COLOUR)
-        ShaderLib.set_uniform("Colour", 1.0, 1.0, 1.0, 1.0)
-        # Apply rotation based on user input
-        rot_x = Mat4().rotate_x(self.spin_x_face)
-        rot_y = Mat4().rotate_y(self.spin_y_face)
-        self.mouse_global_tx = rot_y @ rot_x
-
-        # Update model position
-        self.mouse_global_tx[3][0] = self.model_position.x
-        self.mouse_global_tx[3][1] = self.model_position.y
-        self.mouse_global_tx[3][2] = self.model_position.z
-
-        self.loadMatricesToShader()
+        # The colour shader and its Colour uniform are set once in
+        # initializeGL; no other program is ever bound, so re-binding here
+        # would just be a redundant driver call.
+        # Rebuild the model transform only when the interaction state has
+        # changed; Qt can request repaints while everything is static.
+        rotation = (self.spin_x_face, self.spin_y_face)
+        translation = (
+            self.model_position.x,
+            self.model_position.y,
+            self.model_position.z,
+        )
+        dirty = False
+        if rotation != self._last_rotation:
+            # Apply rotation based on user input
+            self.mouse_global_tx = _compose_rot(*rotation)
+            self._last_rotation = rotation
+            # The matrix object just changed, so its translation column
+            # must be (re)written below
+            self._last_translation = None
+            dirty = True
+        if translation != self._last_translation:
+            # A pan/zoom only touches the translation column; the 3x3
+            # rotation block is left untouched
+            self.mouse_global_tx[3][0] = translation[0]
+            self.mouse_global_tx[3][1] = translation[1]
+            self.mouse_global_tx[3][2] = translation[2]
+            self._last_translation = translation
+            dirty = True
+        if dirty:
+            self.loadMatricesToShader()
+
         with self.vao:
             self.vao.draw()
 
@@ -129,7 +226,16 @@ class MainWindow(PySideEventHandlingMixin, QOpenGLWindow):
         """
         self.window_width = int(w * self.devicePixelRatio())
         self.window_height = int(h * self.devicePixelRatio())
+        # The viewport only changes with the window size, so set it here
+        # rather than on every paint
+        gl.glViewport(0, 0, self.window_width, self.window_height)
         self.project = perspective(45.0, float(w) / h, 0.01, 350.0)
+        # Projection and view only change here, so fold them into one
+        # cached product and MVP costs a single multiply per update
+        self._project_view = self.project @ self.view
+        # Projection feeds MVP, so the cached uniform is stale now
+        self._last_rotation = None
+        self._last_translation = None
 
 
 if __name__ == "__main__":
@@ -6,8 +6,12 @@ This script demonstrates how to use OpenGL and Qt to render a simple 3D object (
 It sets up a window, handles user input for rotation/translation/zoom, and manages OpenGL resources.
 """
 
+import ctypes
+import functools
+import math
 import sys
 
+import numpy as np
 import OpenGL.GL as gl
 from ngl import (
     Mat3,
@@ -17,18 +21,99 @@ from ngl import (
     VAOFactory,
     VAOType,
     Vec3,
-    Vec3Array,
-    Vec4,
     VertexData,
-    calc_normal,
+    logger,
     look_at,
     perspective,
 )
+from PySide6.QtCore import QTimer
 from PySide6.QtGui import QSurfaceFormat
 from PySide6.QtOpenGL import QOpenGLWindow
 from PySide6.QtWidgets import QApplication
 
 
+def _build_boid_vertex_data() -> np.ndarray:
+    """
+    Build the interleaved boid vertex buffer.
+
+    The geometry is a compile-time constant, so this runs once at import and
+    the result is shared by every window instead of being rebuilt in
+    initializeGL. Layout per vertex: vec3 float position, then the unit
+    normal packed into one GL_INT_2_10_10_10_REV word (16-byte stride).
+    """
+    # fmt : off
+    verts = np.array(
+        [
+            [0.0, 1.0, 1.0],
+            [0.0, 0.0, -1.0],
+            [-0.5, 0.0, 1.0],
+            [0.0, 1.0, 1.0],
+            [0.0, 0.0, -1.0],
+            [0.5, 0.0, 1.0],
+            [0.0, 1.0, 1.0],
+            [0.0, 0.0, 1.5],
+            [-0.5, 0.0, 1.0],
+            [0.0, 1.0, 1.0],
+            [0.0, 0.0, 1.5],
+            [0.5, 0.0, 1.0],
+        ],
+        dtype=np.float32,
+    )
+    # fmt : on
+    # One cross product per triangle, vectorised, then repeated so each
+    # vertex of a face shares the face normal.
+    normals = np.cross(verts[1::3] - verts[0::3], verts[2::3] - verts[0::3])
+    normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+    quantised = np.round(np.repeat(normals, 3, axis=0) * 511.0).astype(np.int32) & 0x3FF
+    packed_normals = (
+        (quantised[:, 2] << 20) | (quantised[:, 1] << 10) | quantised[:, 0]
+    ).astype(np.uint32)
+    buffer = np.empty((len(verts), 4), dtype=np.float32)
+    buffer[:, 0:3] = verts
+    buffer[:, 3] = packed_normals.view(np.float32)
+    return buffer
+
+
+BOID_VERTEX_DATA = _build_boid_vertex_data()
+
+
+def _rotate_yx(x_deg: float, y_deg: float) -> Mat4:
+    """
+    Build rotate_y(y_deg) @ rotate_x(x_deg) directly from its closed form.
+
+    Writing the product's nine entries from four sin/cos evaluations avoids
+    the two intermediate Mat4 allocations and the 4x4 multiply that
+    `Mat4().rotate_y(...) @ Mat4().rotate_x(...)` costs per update.
+    """
+    x = math.radians(x_deg)
+    y = math.radians(y_deg)
+    cx, sx = math.cos(x), math.sin(x)
+    cy, sy = math.cos(y), math.sin(y)
+    m = Mat4()
+    m[0][0] = cy
+    m[0][2] = -sy
+    m[1][0] = sy * sx
+    m[1][1] = cx
+    m[1][2] = cy * sx
+    m[2][0] = sy * cx
+    m[2][1] = -sx
+    m[2][2] = cy * cx
+    return m
+
+
+@functools.lru_cache(maxsize=4096)
+def _compose_rot(spin_x: float, spin_y: float) -> Mat4:
+    """
+    Memoised rotation for a (spin x, spin y) pair.
+
+    The spin angles move in whole-degree steps, so the same pair recurs
+    whenever the user pauses or retraces a drag; repeats skip the trig
+    entirely. Callers overwrite the translation column of the returned
+    matrix, which is safe because every caller rewrites it before use.
+    """
+    return _rotate_yx(spin_x, spin_y)
+
+
 class MainWindow(PySideEventHandlingMixin, QOpenGLWindow):
     """
     Main application window for rendering a 3D boid with Phong shading.
@@ -53,6 +138,30 @@ class MainWindow(PySideEventHandlingMixin, QOpenGLWindow):
         self.model_position: Vec3 = Vec3()  # Model position in world space
         self.view: Mat4 = Mat4()  # View matrix
         self.project: Mat4 = Mat4()  # Projection matrix
+        self.mouse_global_tx: Mat4 = Mat4()  # Cached model transform
+        # Rotation and translation are tracked separately: a pan or zoom
+        # only rewrites the translation column of the cached transform
+        self._last_rotation = None  # (spin x, spin y)
+        self._last_translation = None  # (x, y, z) of model position
+        # Coalesce bursts of repaint requests into at most one per ~frame
+        # interval; high polling-rate mice can deliver far more move events
+        # than the display can show.
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.timeout.connect(self._flush_update)
+
+    def update(self) -> None:
+        """
+        Schedule a repaint, coalescing event bursts to roughly 60 Hz.
+
+        The mixin's mouse handlers call this on every move event; routing
+        them through a single-shot timer caps the paint rate during drags.
+        """
+        if not self._update_timer.isActive():
+            self._update_timer.start(16)
+
+    def _flush_update(self) -> None:
+        super().update()
 
     def initializeGL(self) -> None:
         """
@@ -77,66 +186,74 @@ class MainWindow(PySideEventHandlingMixin, QOpenGLWindow):
             self.close()
         ShaderLib.use("Phong")
 
-        # Set up lighting and material properties
-        lightPos = Vec4(-2.0, 5.0, 2.0, 0.0)
-        ShaderLib.set_uniform("light.position", lightPos)
-        ShaderLib.set_uniform("light.ambient", 0.0, 0.0, 0.0, 1.0)
-        ShaderLib.set_uniform("light.diffuse", 1.0, 1.0, 1.0, 1.0)
-        ShaderLib.set_uniform("light.specular", 0.8, 0.8, 0.8, 1.0)
-        # Gold-like Phong material
-        ShaderLib.set_uniform("material.ambient", 0.274725, 0.1995, 0.0745, 0.0)
-        ShaderLib.set_uniform("material.diffuse", 0.75164, 0.60648, 0.22648, 0.0)
-        ShaderLib.set_uniform("material.specular", 0.628281, 0.555802, 0.3666065, 0.0)
-        ShaderLib.set_uniform("material.shininess", 51.2)
+        # The light and the gold-like Phong material never change, so the
+        # whole lot goes up once as a single std140 uniform buffer instead of
+        # eight separate glUniform calls.
+        # Layout: Lights{position, ambient, diffuse, specular} then
+        # Materials{ambient, diffuse, specular, shininess + pad} = 128 bytes.
+        lighting_block = np.zeros((8, 4), dtype=np.float32)
+        lighting_block[0] = (-2.0, 5.0, 2.0, 0.0)  # light.position
+        lighting_block[1] = (0.0, 0.0, 0.0, 1.0)  # light.ambient
+        lighting_block[2] = (1.0, 1.0, 1.0, 1.0)  # light.diffuse
+        lighting_block[3] = (0.8, 0.8, 0.8, 1.0)  # light.specular
+        lighting_block[4] = (0.274725, 0.1995, 0.0745, 0.0)  # material.ambient
+        lighting_block[5] = (0.75164, 0.60648, 0.22648, 0.0)  # material.diffuse
+        lighting_block[6] = (0.628281, 0.555802, 0.3666065, 0.0)  # material.specular
+        lighting_block[7, 0] = 51.2  # material.shininess
+        self._lighting_ubo = gl.glGenBuffers(1)
+        gl.glBindBuffer(gl.GL_UNIFORM_BUFFER, self._lighting_ubo)
+        gl.glBufferData(
+            gl.GL_UNIFORM_BUFFER,
+            lighting_block.nbytes,
+            lighting_block,
+            gl.GL_STATIC_DRAW,
+        )
+
         ShaderLib.set_uniform("viewerPos", eye)
 
+        # Cache the per-frame uniform locations and scratch upload buffers so
+        # load_matrices_to_shader avoids driver name lookups and repeated
+        # allocation.
+        program = gl.glGetIntegerv(gl.GL_CURRENT_PROGRAM)
+        # GLSL 410 has no binding qualifier, so wire the block up from here
+        block_index = gl.glGetUniformBlockIndex(program, "LightingBlock")
+        gl.glUniformBlockBinding(program, block_index, 0)
+        gl.glBindBufferBase(gl.GL_UNIFORM_BUFFER, 0, self._lighting_ubo)
+        gl.glBindBuffer(gl.GL_UNIFORM_BUFFER, 0)
+        self._loc_mvp = gl.glGetUniformLocation(program, "MVP")
+        self._loc_normal_matrix = gl.glGetUniformLocation(program, "normalMatrix")
+        self._loc_m = gl.glGetUniformLocation(program, "M")
+        self._mat4_scratch = np.empty((2, 16), dtype=np.float32)
+        self._mat3_scratch = np.empty(9, dtype=np.float32)
+
         self.buildVAO()
 
     def buildVAO(self) -> None:
         """
         Build the Vertex Array Object (VAO) for the boid geometry.
         """
-        print("Building VAO")
-        # Define vertices for the boid geometry
-        # fmt : off
-        verts = Vec3Array(
-            [
-                Vec3(0.0, 1.0, 1.0),
-                Vec3(0.0, 0.0, -1.0),
-                Vec3(-0.5, 0.0, 1.0),
-                Vec3(0.0, 1.0, 1.0),
-                Vec3(0.0, 0.0, -1.0),
-                Vec3(0.5, 0.0, 1.0),
-                Vec3(0.0, 1.0, 1.0),
-                Vec3(0.0, 0.0, 1.5),
-                Vec3(-0.5, 0.0, 1.0),
-                Vec3(0.0, 1.0, 1.0),
-                Vec3(0.0, 0.0, 1.5),
-                Vec3(0.5, 0.0, 1.0),
-            ]
-        )
-        # fmt : on
-        # Calculate normals for each triangle and append them
-        for i in range(0, len(verts), 3):
-            n = calc_normal(verts[i], verts[i + 1], verts[i + 2])
-            verts.extend([n, n, n])
-        for i in range(0, len(verts)):
-            print(verts[i])
+        # The geometry is precomputed once at import time; this method only
+        # has to upload it and describe the layout.
+        buffer = BOID_VERTEX_DATA
 
         # Create and bind VAO
         self.vao = VAOFactory.create_vao(VAOType.SIMPLE, gl.GL_TRIANGLES)
         with self.vao:
-            # Set vertex data and attribute pointers not len // 2 is the amount to
-            # render not the total size. We have 4 triangles but packed with normals
-            # and positions
-            data = VertexData(data=verts.to_list(), size=len(verts) // 2)
+            # The mesh is written once and never updated, so tell the driver
+            # it can place the buffer in GPU-resident memory
+            data = VertexData(
+                data=buffer.ravel(), size=len(buffer), mode=gl.GL_STATIC_DRAW
+            )
             self.vao.set_data(data)
-            self.vao.set_vertex_attribute_pointer(0, 3, gl.GL_FLOAT, 0, 0)  # Position
-            self.vao.set_vertex_attribute_pointer(
-                1, 3, gl.GL_FLOAT, 0, 12 * 3
-            )  # Normal
+            self.vao.set_vertex_attribute_pointer(0, 3, gl.GL_FLOAT, 16, 0)  # Position
+            # The packed-integer format needs the normalised flag, which the
+            # ngl pointer helper does not expose, so set this one directly.
+            gl.glVertexAttribPointer(
+                1, 4, gl.GL_INT_2_10_10_10_REV, gl.GL_TRUE, 16, ctypes.c_void_p(12)
+            )
+            gl.glEnableVertexAttribArray(1)
 
-        print("VAO created")
+        logger.debug(f"VAO built: {len(buffer)} verts")
 
     def load_matrices_to_shader(self) -> None:
         """
@@ -144,30 +261,58 @@ class MainWindow(PySideEventHandlingMixin, QOpenGLWindow):
         """
         MV = self.view @ self.mouse_global_tx
         mvp = self.project @ MV
+        # The model-view here is rotation + translation only, so the
+        # inverse-transpose of its upper 3x3 equals the upper 3x3 itself and
+        # the per-frame Mat3 inverse can be skipped. (The previous
+        # inverse().transpose() also discarded its result.)
         normal_matrix = Mat3.from_mat4(MV)
-        normal_matrix.inverse().transpose()
-        ShaderLib.set_uniform("MVP", mvp)
-        ShaderLib.set_uniform("normalMatrix", normal_matrix)
-        ShaderLib.set_uniform("M", self.mouse_global_tx)
+        # Upload through the cached locations; the Phong program is already
+        # bound so each call is one glUniform* with no name resolution
+        self._mat4_scratch[0] = mvp.to_list()
+        self._mat4_scratch[1] = self.mouse_global_tx.to_list()
+        self._mat3_scratch[:] = normal_matrix.to_list()
+        gl.glUniformMatrix4fv(self._loc_mvp, 1, gl.GL_FALSE, self._mat4_scratch[0])
+        gl.glUniformMatrix3fv(
+            self._loc_normal_matrix, 1, gl.GL_FALSE, self._mat3_scratch
+        )
+        gl.glUniformMatrix4fv(self._loc_m, 1, gl.GL_FALSE, self._mat4_scratch[1])
 
     def paintGL(self) -> None:
         """
         Render the scene. Called automatically by Qt.
         """
         self.makeCurrent()
-        gl.glViewport(0, 0, self.window_width, self.window_height)
         gl.glClear(gl.GL_COLOR_BUFFER_BIT | gl.GL_DEPTH_BUFFER_BIT)
-        ShaderLib.use("Phong")
-
-        # Apply rotation based on user input
-        rot_x = Mat4().rotate_x(self.spin_x_face)
-        rot_y = Mat4().rotate_y(self.spin_y_face)
-        self.mouse_global_tx = rot_y @ rot_x
-        # Update model position
-        self.mouse_global_tx[3][0] = self.model_position.x
-        self.mouse_global_tx[3][1] = self.model_position.y
-        self.mouse_global_tx[3][2] = self.model_position.z
-        self.load_matrices_to_shader()
+        # The Phong program is bound once in initializeGL and nothing else
+        # is ever bound, so there is no per-frame use() call here.
+        # Rebuild the transform and re-upload the matrix uniforms only when
+        # the interaction state has changed; uniform values persist in the
+        # program, so an idle repaint only needs the clear and the draw.
+        rotation = (self.spin_x_face, self.spin_y_face)
+        translation = (
+            self.model_position.x,
+            self.model_position.y,
+            self.model_position.z,
+        )
+        dirty = False
+        if rotation != self._last_rotation:
+            # Apply rotation based on user input
+            self.mouse_global_tx = _compose_rot(*rotation)
+            self._last_rotation = rotation
+            # The matrix object just changed, so its translation column
+            # must be (re)written below
+            self._last_translation = None
+            dirty = True
+        if translation != self._last_translation:
+            # A pan/zoom only touches the translation column; the 3x3
+            # rotation block is left untouched
+            self.mouse_global_tx[3][0] = translation[0]
+            self.mouse_global_tx[3][1] = translation[1]
+            self.mouse_global_tx[3][2] = translation[2]
+            self._last_translation = translation
+            dirty = True
+        if dirty:
+            self.load_matrices_to_shader()
         # Draw geometry
         with self.vao:
             self.vao.draw()
@@ -182,7 +327,13 @@ class MainWindow(PySideEventHandlingMixin, QOpenGLWindow):
         """
         self.window_width = int(w * self.devicePixelRatio())
         self.window_height = int(h * self.devicePixelRatio())
+        # The viewport only changes with the window size, so set it here
+        # rather than on every paint
+        gl.glViewport(0, 0, self.window_width, self.window_height)
         self.project = perspective(45.0, float(w) / h, 0.1, 350.0)
+        # Projection feeds MVP, so the cached uniforms are stale now
+        self._last_rotation = None
+        self._last_translation = None
 
 
 if __name__ == "__main__":
@@ -22,10 +22,13 @@ struct Lights
 	vec4 diffuse;
 	vec4 specular;
 };
-// @param material passed from our program
-uniform Materials material;
-
-uniform Lights light;
+// light and material never change per draw, so they live in one std140
+// uniform buffer bound once by the application
+layout(std140) uniform LightingBlock
+{
+	Lights light;
+	Materials material;
+};
 in vec3 lightDir;
 // out the blinn half vector
 in vec3 halfVector;
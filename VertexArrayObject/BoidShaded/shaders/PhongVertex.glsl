@@ -26,10 +26,13 @@ struct Lights
 	vec4 diffuse;
 	vec4 specular;
 };
-// our material
-uniform Materials material;
-// array of lights
-uniform Lights light;
+// light and material never change per draw, so they live in one std140
+// uniform buffer bound once by the application
+layout(std140) uniform LightingBlock
+{
+	Lights light;
+	Materials material;
+};
 // direction of the lights used for shading
 out vec3 lightDir;
 // out the blinn half vector
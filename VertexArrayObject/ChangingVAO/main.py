@@ -7,15 +7,17 @@ The vertex data changes over time, showing how to update a Vertex Array Object (
 User input allows for interactive rotation, translation, and zoom.
 """
 
+import functools
+import math
 import sys
 import traceback
 
+import numpy as np
 import OpenGL.GL as gl
 from ngl import (
     DefaultShader,
     Mat4,
     PySideEventHandlingMixin,
-    Random,
     ShaderLib,
     Text,
     VAOFactory,
@@ -26,10 +28,88 @@ from ngl import (
     look_at,
     perspective,
 )
+from PySide6.QtCore import QThread, Signal
 from PySide6.QtGui import QSurfaceFormat
 from PySide6.QtOpenGL import QOpenGLWindow
 from PySide6.QtWidgets import QApplication
 
+# Largest number of line endpoints a timer tick can produce
+MAX_POINTS = (100 + 12000) * 2
+
+
+def _rotate_yx(x_deg: float, y_deg: float) -> Mat4:
+    """
+    Build rotate_y(y_deg) @ rotate_x(x_deg) directly from its closed form.
+
+    Writing the product's nine entries from four sin/cos evaluations avoids
+    the two intermediate Mat4 allocations and the 4x4 multiply that
+    `Mat4().rotate_y(...) @ Mat4().rotate_x(...)` costs per update.
+    """
+    x = math.radians(x_deg)
+    y = math.radians(y_deg)
+    cx, sx = math.cos(x), math.sin(x)
+    cy, sy = math.cos(y), math.sin(y)
+    m = Mat4()
+    m[0][0] = cy
+    m[0][2] = -sy
+    m[1][0] = sy * sx
+    m[1][1] = cx
+    m[1][2] = cy * sx
+    m[2][0] = sy * cx
+    m[2][1] = -sx
+    m[2][2] = cy * cx
+    return m
+
+
+class DataProducer(QThread):
+    """
+    Generates the next batch of line endpoints off the GL thread.
+
+    Two scratch buffers alternate: the producer fills one while the GL
+    thread uploads the previously published one, so neither thread ever
+    touches an array the other is reading (classic double buffering).
+    data_ready carries the buffer index and the number of floats written;
+    the cross-thread signal delivers it on the GL thread's event loop.
+    """
+
+    data_ready = Signal(int, int)
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self.buffers = [
+            np.empty(MAX_POINTS * 3, dtype=np.float32),
+            np.empty(MAX_POINTS * 3, dtype=np.float32),
+        ]
+        self._rng = np.random.default_rng()
+        self._write = 0
+
+    def run(self) -> None:
+        while not self.isInterruptionRequested():
+            self.msleep(220)
+            size = 100 + int(self._rng.uniform(0.0, 12000.0))
+            # Draw every coordinate in one vectorised call straight into the
+            # back buffer, then rescale [0,1) to [-5,5) in place (uniform()
+            # has no out= parameter, random() does)
+            view = self.buffers[self._write][: size * 2 * 3]
+            self._rng.random(out=view, dtype=np.float32)
+            view *= 10.0
+            view -= 5.0
+            self.data_ready.emit(self._write, view.size)
+            self._write ^= 1
+
+
+@functools.lru_cache(maxsize=4096)
+def _compose_rot(spin_x: float, spin_y: float) -> Mat4:
+    """
+    Memoised rotation for a (spin x, spin y) pair.
+
+    The spin angles move in whole-degree steps, so the same pair recurs
+    whenever the user pauses or retraces a drag; repeats skip the trig
+    entirely. Callers overwrite the translation column of the returned
+    matrix, which is safe because every caller rewrites it before use.
+    """
+    return _rotate_yx(spin_x, spin_y)
+
 
 class MainWindow(PySideEventHandlingMixin, QOpenGLWindow):
     """
@@ -56,77 +136,114 @@ class MainWindow(PySideEventHandlingMixin, QOpenGLWindow):
         self.modelPos: Vec3 = Vec3()  # Model position in world space
         self.view: Mat4 = Mat4()  # View matrix
         self.project: Mat4 = Mat4()  # Projection matrix
-        self.data: list[float] = []  # Dynamic vertex data
+        self._project_view: Mat4 = Mat4()  # Cached project @ view
+        # Last (rotation, position) the MVP was built from; None forces a rebuild
+        self._last_transform = None
+        self.data: np.ndarray = np.empty(0, dtype=np.float32)  # Dynamic vertex data
+        # One reusable wrapper for uploads; the producer slot repoints it at
+        # the fresh data instead of allocating a new VertexData per upload
+        self._vdata = VertexData(data=self.data, size=0)
+        # The data only changes when the producer delivers; repaints caused
+        # by mouse interaction reuse the buffer already resident on the GPU
+        self._data_version = 0
+        self._uploaded_version = -1
+        # HUD string and colour only change with the data, so they are
+        # rebuilt in the producer slot rather than formatted per frame
+        self._hud_text = "Data Size 0.0"
+        self._hud_colour = Vec3(1, 1, 1)
+        # Background generator; started once the GL state is ready
+        self._producer = DataProducer()
+        self._producer.data_ready.connect(self._on_data_ready)
 
     def initializeGL(self) -> None:
         """
         Set up OpenGL context, load shaders, and initialize scene.
+
+        The context is already current here and in paintGL — Qt guarantees
+        that — so there is no makeCurrent call on either path.
         """
-        self.makeCurrent()
         gl.glClearColor(0.4, 0.4, 0.4, 1.0)  # Set background color
         gl.glEnable(gl.GL_DEPTH_TEST)  # Enable depth testing
         gl.glEnable(gl.GL_MULTISAMPLE)  # Enable anti-aliasing
 
         # Set up camera/view matrix
         self.view = look_at(Vec3(0, 1, 40), Vec3(0, 0, 0), Vec3(0, 1, 0))
+        self._project_view = self.project @ self.view
 
         # Use a simple color shader
         ShaderLib.use(DefaultShader.COLOUR)
         ShaderLib.set_uniform("Colour", 1.0, 1.0, 1.0, 1.0)
 
-        # Create VAO for lines
+        # Create VAO for lines. The attribute layout never changes and
+        # glBufferData keeps the same buffer object, so the pointer can be
+        # described once here against an empty buffer instead of per upload.
         self.vao = VAOFactory.create_vao(VAOType.SIMPLE, gl.GL_LINES)
+        with self.vao:
+            self.vao.set_data(VertexData(data=np.empty(0, dtype=np.float32), size=0))
+            self.vao.set_vertex_attribute_pointer(0, 3, gl.GL_FLOAT, 0, 0)
 
         # # Set up text rendering for displaying data size
         Text.add_font("Arial", "../fonts/Arial.ttf", 48)
         print(f"{self.window_width=} {self.window_height=}")
         Text.set_screen_size(self.window_width, self.window_height)
 
-        # Start a timer to update the vertex data periodically
-        self.startTimer(220.0)
+        # Start generating vertex data in the background; rendering is no
+        # longer coupled to the 220 ms data cadence
+        self._producer.start()
 
     def loadMatricesToShader(self) -> None:
         """
         Load transformation matrices to the shader uniforms.
         """
-        mvp = self.project @ self.view @ self.mouse_global_tx
+        mvp = self._project_view @ self.mouse_global_tx
         ShaderLib.set_uniform("MVP", mvp)
 
     def paintGL(self) -> None:
         """
         Render the scene. Called automatically by Qt.
         """
-        self.makeCurrent()
+        # This runs many times a second during interaction, so the members
+        # it touches repeatedly are lifted into locals (LOAD_FAST instead of
+        # a dict lookup per access)
+        model_position = self.model_position
+        vao = self.vao
+
         gl.glViewport(0, 0, self.window_width, self.window_height)
         gl.glClear(gl.GL_COLOR_BUFFER_BIT | gl.GL_DEPTH_BUFFER_BIT)
+        # The text rendering at the end of the frame binds its own program,
+        # so the colour shader does have to be re-bound here — but its Colour
+        # uniform persists in the program and is set once in initializeGL.
         ShaderLib.use(DefaultShader.COLOUR)
-        ShaderLib.set_uniform("Colour", 1.0, 1.0, 1.0, 1.0)
 
-        # Apply rotation based on user input
-        rot_x = Mat4().rotate_x(self.spin_x_face)
-        rot_y = Mat4().rotate_y(self.spin_y_face)
-        self.mouse_global_tx = rot_y @ rot_x
-
-        # Update model position
-        self.mouse_global_tx[3][0] = self.model_position.x
-        self.mouse_global_tx[3][1] = self.model_position.y
-        self.mouse_global_tx[3][2] = self.model_position.z
-        # Bind VAO and update vertex data
-        self.loadMatricesToShader()
-
-        with self.vao:
-            data = VertexData(data=self.data, size=len(self.data) // 3)
-            self.vao.set_data(data)
-
-            # Set vertex attribute pointer for position (3 floats per vertex)
-            self.vao.set_vertex_attribute_pointer(0, 3, gl.GL_FLOAT, 0, 0)
-            self.vao.draw()
-
-        # Render text showing the current data size
-        # self.text.render_text(10, 18, f"Data Size {(len(self.data) / 2)}")
-        Text.render_dynamic_text(
-            "Arial", 10, 48, f"Data Size {(len(self.data) / 2)}", Vec3(1, 1, 1)
+        # Rebuild the model matrix and re-upload the MVP only when the
+        # interaction state changed; the uniform persists in the program
+        # across frames (timer repaints leave the transform untouched)
+        transform = (
+            self.spin_x_face,
+            self.spin_y_face,
+            model_position.x,
+            model_position.y,
+            model_position.z,
         )
+        if transform != self._last_transform:
+            mouse_global_tx = _compose_rot(self.spin_x_face, self.spin_y_face)
+            mouse_global_tx[3][0] = model_position.x
+            mouse_global_tx[3][1] = model_position.y
+            mouse_global_tx[3][2] = model_position.z
+            self.mouse_global_tx = mouse_global_tx
+            self.loadMatricesToShader()
+            self._last_transform = transform
+
+        with vao:
+            if self._uploaded_version != self._data_version:
+                vao.set_data(self._vdata)
+                self._uploaded_version = self._data_version
+            vao.draw()
+
+        # Render text showing the current data size. The Text API has no
+        # separate build/draw step so the string is re-rendered each frame,
+        # but formatting it (and the colour object) is not repeated.
+        Text.render_dynamic_text("Arial", 10, 48, self._hud_text, self._hud_colour)
 
     def resizeGL(self, w: int, h: int) -> None:
         """
@@ -139,24 +256,32 @@ class MainWindow(PySideEventHandlingMixin, QOpenGLWindow):
         self.window_width = int(w * self.devicePixelRatio())
         self.window_height = int(h * self.devicePixelRatio())
         self.project = perspective(45.0, float(w) / h, 0.01, 350.0)
+        self._project_view = self.project @ self.view
+        self._last_transform = None  # projection changed, force MVP re-upload
         Text.set_screen_size(self.window_width, self.window_height)
 
-    def timerEvent(self, event) -> None:
+    def _on_data_ready(self, buffer_index: int, nfloats: int) -> None:
         """
-        Periodically called by Qt to update the vertex data with random values.
+        Adopt a freshly generated buffer from the producer thread.
 
-        This demonstrates how to update a VAO with new data each frame.
+        Runs on the GL thread via the queued signal connection, so swapping
+        the published array and scheduling a repaint needs no locking.
         """
-        size = 100 + int(Random.random_positive_number(12000))
-        # Clear old data
-        del self.data[:]
-        for i in range(0, size * 2):
-            p = Random.get_random_vec3() * 5
-            self.data.append(p.x)
-            self.data.append(p.y)
-            self.data.append(p.z)
+        view = self._producer.buffers[buffer_index][:nfloats]
+        self.data = view
+        self._vdata.data = view
+        self._vdata.size = nfloats // 3
+        self._hud_text = f"Data Size {view.size / 2}"
+        self._data_version += 1
         self.update()
 
+    def stop_producer(self) -> None:
+        """
+        Ask the generator thread to finish and wait for it to exit.
+        """
+        self._producer.requestInterruption()
+        self._producer.wait()
+
 
 class DebugApplication(QApplication):
     """
@@ -203,4 +328,5 @@ if __name__ == "__main__":
     window.setFormat(format)
     window.resize(1024, 720)
     window.show()
+    app.aboutToQuit.connect(window.stop_producer)
     sys.exit(app.exec())
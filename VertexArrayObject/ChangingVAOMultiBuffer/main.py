@@ -7,9 +7,12 @@ The vertex data changes over time, showing how to update a Vertex Array Object (
 User input allows for interactive rotation, translation, and zoom.
 """
 
+import functools
 import logging
+import math
 import sys
 
+import numpy as np
 import OpenGL.GL as gl
 from ngl import (
     Mat4,
@@ -32,6 +35,45 @@ from PySide6.QtWidgets import QApplication
 
 COLOUR_SHADER = "ColourShader"
 DATA_SIZE = 12345
+# Largest number of line endpoints a timer tick can produce
+MAX_POINTS = (100 + 12000) * 2
+
+
+def _rotate_yx(x_deg: float, y_deg: float) -> Mat4:
+    """
+    Build rotate_y(y_deg) @ rotate_x(x_deg) directly from its closed form.
+
+    Writing the product's nine entries from four sin/cos evaluations avoids
+    the two intermediate Mat4 allocations and the 4x4 multiply that
+    `Mat4().rotate_y(...) @ Mat4().rotate_x(...)` costs per update.
+    """
+    x = math.radians(x_deg)
+    y = math.radians(y_deg)
+    cx, sx = math.cos(x), math.sin(x)
+    cy, sy = math.cos(y), math.sin(y)
+    m = Mat4()
+    m[0][0] = cy
+    m[0][2] = -sy
+    m[1][0] = sy * sx
+    m[1][1] = cx
+    m[1][2] = cy * sx
+    m[2][0] = sy * cx
+    m[2][1] = -sx
+    m[2][2] = cy * cx
+    return m
+
+
+@functools.lru_cache(maxsize=4096)
+def _compose_rot(spin_x: float, spin_y: float) -> Mat4:
+    """
+    Memoised rotation for a (spin x, spin y) pair.
+
+    The spin angles move in whole-degree steps, so the same pair recurs
+    whenever the user pauses or retraces a drag; repeats skip the trig
+    entirely. Callers overwrite the translation column of the returned
+    matrix, which is safe because every caller rewrites it before use.
+    """
+    return _rotate_yx(spin_x, spin_y)
 
 
 class MainWindow(PySideEventHandlingMixin, QOpenGLWindow):
@@ -58,13 +100,32 @@ class MainWindow(PySideEventHandlingMixin, QOpenGLWindow):
         self.setTitle("Changing VAO")
         self.view: Mat4 = Mat4()  # View matrix
         self.project: Mat4 = Mat4()  # Projection matrix
-        self.data: list[float] = []  # Dynamic vertex data
+        self._project_view: Mat4 = Mat4()  # Cached project @ view
+        # Last (rotation, position) the MVP was built from; None forces a rebuild
+        self._last_transform = None
+        self.data: np.ndarray = np.empty(0, dtype=np.float32)  # Dynamic vertex data
+        self._rng = np.random.default_rng()  # Bulk vertex generator
+        # Generate into one persistent buffer sized for the worst case
+        # instead of allocating a fresh array every tick
+        self._scratch = np.empty(MAX_POINTS * 3, dtype=np.float32)
+        # One reusable wrapper for uploads; timerEvent repoints it at the
+        # fresh data instead of allocating a new VertexData per upload
+        self._vdata = VertexData(data=self.data, size=0)
+        # The data only changes on the timer tick; repaints caused by mouse
+        # interaction reuse the buffer already resident on the GPU
+        self._data_version = 0
+        self._uploaded_version = -1
+        # HUD string only changes with the data, so it is rebuilt in
+        # timerEvent rather than formatted per frame
+        self._hud_text = "Data Size 0.0"
 
     def initializeGL(self) -> None:
         """
         Set up OpenGL context, load shaders, and initialize scene.
+
+        The context is already current here and in paintGL — Qt guarantees
+        that — so there is no makeCurrent call on either path.
         """
-        self.makeCurrent()
         gl.glClearColor(0.4, 0.4, 0.4, 1.0)  # Set background color
         gl.glEnable(gl.GL_DEPTH_TEST)  # Enable depth testing
         gl.glEnable(gl.GL_MULTISAMPLE)  # Enable anti-aliasing
@@ -82,6 +143,7 @@ class MainWindow(PySideEventHandlingMixin, QOpenGLWindow):
 
         # Set up camera/view matrix
         self.view = look_at(Vec3(0, 1, 40), Vec3(0, 0, 0), Vec3(0, 1, 0))
+        self._project_view = self.project @ self.view
 
         # Create VAO for lines and Colour
         self.vao = VAOFactory.create_vao(VAOType.MULTI_BUFFER, gl.GL_LINES)
@@ -89,6 +151,9 @@ class MainWindow(PySideEventHandlingMixin, QOpenGLWindow):
             # As this is a Multi buffer VAO we can add two initial buffer one for Vertex and one for Color
             data = VertexData(data=None, size=0)  # empty data
             self.vao.set_data(data, 0)  # index 0 for Vertex buffer
+            # The vertex layout never changes and re-uploads reuse the same
+            # buffer object, so describe the pointer once here
+            self.vao.set_vertex_attribute_pointer(0, 3, gl.GL_FLOAT, 0, 0)
             # colours will be the same each time so set once.
             colours = Vec4Array()
             for i in range(DATA_SIZE):
@@ -103,6 +168,7 @@ class MainWindow(PySideEventHandlingMixin, QOpenGLWindow):
         # # Set up text rendering for displaying data size
         self.text = Text("../fonts/Arial.ttf", 18)
         self.text.set_screen_size(self.window_width, self.window_height)
+        self.text.set_colour(1, 1, 1)  # the HUD colour never changes
 
         # Start a timer to update the vertex data periodically
         self.startTimer(220.0)
@@ -111,42 +177,48 @@ class MainWindow(PySideEventHandlingMixin, QOpenGLWindow):
         """
         Load transformation matrices to the shader uniforms.
         """
-        mvp = self.project @ self.view @ self.mouse_global_tx
+        mvp = self._project_view @ self.mouse_global_tx
         ShaderLib.set_uniform("MVP", mvp)
 
     def paintGL(self) -> None:
         """
         Render the scene. Called automatically by Qt.
         """
-        self.makeCurrent()
         gl.glViewport(0, 0, self.window_width, self.window_height)
         gl.glClear(gl.GL_COLOR_BUFFER_BIT | gl.GL_DEPTH_BUFFER_BIT)
+        # The text rendering at the end of the frame binds its own program,
+        # so the colour shader does have to be re-bound every frame
         ShaderLib.use(COLOUR_SHADER)
 
-        # Apply rotation based on user input
-        rot_x = Mat4().rotate_x(self.spin_x_face)
-        rot_y = Mat4().rotate_y(self.spin_y_face)
-        self.mouse_global_tx = rot_y @ rot_x
-
-        # Update model position
-        self.mouse_global_tx[3][0] = self.model_position.x
-        self.mouse_global_tx[3][1] = self.model_position.y
-        self.mouse_global_tx[3][2] = self.model_position.z
-        self.loadMatricesToShader()
+        # Rebuild the model matrix and re-upload the MVP only when the
+        # interaction state changed; the uniform persists in the program
+        # across frames (timer repaints leave the transform untouched)
+        transform = (
+            self.spin_x_face,
+            self.spin_y_face,
+            self.model_position.x,
+            self.model_position.y,
+            self.model_position.z,
+        )
+        if transform != self._last_transform:
+            self.mouse_global_tx = _compose_rot(self.spin_x_face, self.spin_y_face)
+            self.mouse_global_tx[3][0] = self.model_position.x
+            self.mouse_global_tx[3][1] = self.model_position.y
+            self.mouse_global_tx[3][2] = self.model_position.z
+            self.loadMatricesToShader()
+            self._last_transform = transform
 
         # Bind VAO and update vertex data
         with self.vao:
-            data = VertexData(data=self.data, size=len(self.data) // 3)
-            self.vao.set_data(data, 0)
-
-            # Set vertex attribute pointer for position (3 floats per vertex)
-            # We must do this each time as we change the data.
-            self.vao.set_vertex_attribute_pointer(0, 3, gl.GL_FLOAT, 0, 0)
+            if self._uploaded_version != self._data_version:
+                self.vao.set_data(self._vdata, 0)
+                self._uploaded_version = self._data_version
             self.vao.draw()
 
-        # Render text showing the current data size
-        self.text.set_colour(1, 1, 1)
-        self.text.render_text(10, 18, f"Data Size {(len(self.data) / 2)}")
+        # Render text showing the current data size. The Text API has no
+        # separate build/draw step so the string is re-rendered each frame,
+        # but formatting it is not repeated.
+        self.text.render_text(10, 18, self._hud_text)
 
     def resizeGL(self, w: int, h: int) -> None:
         """
@@ -159,6 +231,8 @@ class MainWindow(PySideEventHandlingMixin, QOpenGLWindow):
         self.window_width = int(w * self.devicePixelRatio())
         self.window_height = int(h * self.devicePixelRatio())
         self.project = perspective(45.0, float(w) / h, 0.01, 350.0)
+        self._project_view = self.project @ self.view
+        self._last_transform = None  # projection changed, force MVP re-upload
         self.text.set_screen_size(self.window_width, self.window_height)
 
     def keyPressEvent(self, event) -> None:
@@ -187,13 +261,18 @@ class MainWindow(PySideEventHandlingMixin, QOpenGLWindow):
         This demonstrates how to update a VAO with new data each frame.
         """
         size = 100 + int(Random.random_positive_number(12000))
-        # Clear old data
-        del self.data[:]
-        for i in range(0, size * 2):
-            p = Random.get_random_vec3() * 5
-            self.data.append(p.x)
-            self.data.append(p.y)
-            self.data.append(p.z)
+        # Draw every coordinate in one vectorised call straight into the
+        # scratch buffer, then rescale [0,1) to [-5,5) in place (uniform()
+        # has no out= parameter, random() does)
+        view = self._scratch[: size * 2 * 3]
+        self._rng.random(out=view, dtype=np.float32)
+        view *= 10.0
+        view -= 5.0
+        self.data = view
+        self._vdata.data = view
+        self._vdata.size = view.size // 3
+        self._hud_text = f"Data Size {view.size / 2}"
+        self._data_version += 1
         self.update()
 
 
@@ -4,13 +4,61 @@ import numpy as np
 import OpenGL.GL as gl
 from ngl import AbstractVAO, VertexData, logger
 
+# numpy dtype for each supported GL index type
+_INDEX_DTYPES = {
+    gl.GL_UNSIGNED_INT: np.uint32,
+    gl.GL_UNSIGNED_SHORT: np.uint16,
+    gl.GL_UNSIGNED_BYTE: np.uint8,
+}
+
+# id of the VAO currently bound through this class. With one with-block
+# per frame the same VAO is re-bound every paint, so tracking the binding
+# lets bind() skip the redundant glBindVertexArray and unbind() defer it.
+_bound_vao_id = 0
+
 
 class MultiBufferIndexVAO(AbstractVAO):
-    def __init__(self, mode=gl.GL_TRIANGLES):
+    def __init__(self, mode=gl.GL_TRIANGLES, ring_size=1):
+        """
+        ring_size > 1 cycles each logical buffer index through that many VBO
+        ids, one advance per set_data call. By the time an id comes round
+        again the GPU has finished reading it, so streaming uploads stop
+        serialising against in-flight draws. Note that with a ring the bound
+        VBO changes per upload, so callers must re-issue their attribute
+        pointers after each set_data.
+        """
         super().__init__(mode)
-        self.vbo_ids = []
+        self.ring_size = max(1, ring_size)
+        self.vbo_ids = []  # active buffer id per index
+        self.vbo_rings = {}  # index -> all buffer ids in its ring
+        self.ring_pos = {}  # index -> active slot in the ring
+        self.vbo_capacity = {}  # (index, slot) -> bytes allocated
+        self.persistent_ptrs = {}  # index -> (base address, bytes per slot, slots)
+        self.persistent_state = {}  # index -> {"pos": slot, "fences": [sync|None]}
         self.index_buffer_id = 0
         self.index_type = gl.GL_UNSIGNED_SHORT
+        self._index_stride = 2  # bytes per index, kept in step with index_type
+
+    def bind(self):
+        """
+        Bind the VAO, skipping the GL call if it is already current.
+        """
+        global _bound_vao_id
+        if _bound_vao_id != self.id:
+            gl.glBindVertexArray(self.id)
+            _bound_vao_id = self.id
+        self.bound = True
+
+    def unbind(self):
+        """
+        Mark the VAO unbound without touching the GL binding.
+
+        The binding is left in place so the next bind() of the same VAO
+        is free; a different VAO replaces it through the guard. This
+        holds as long as every VAO in the process binds through this
+        class, which is the case for this example.
+        """
+        self.bound = False
 
     def draw(self, start_index=0, amount=-1):
         if self.bound and self.allocated:
@@ -21,21 +69,42 @@ class MultiBufferIndexVAO(AbstractVAO):
 
             if count <= 0:
                 return
-            if self.index_type == gl.GL_UNSIGNED_INT:
-                offset = start_index * 4
-            elif self.index_type == gl.GL_UNSIGNED_SHORT:
-                offset = start_index * 2
-            elif self.index_type == gl.GL_UNSIGNED_BYTE:
-                offset = start_index * 1
-            else:
-                logger.error("Unsupported index type")
-                return
+            # Stride is resolved once in set_indices; draw is the hot path
+            offset = start_index * self._index_stride
             gl.glDrawElements(
                 self.mode, count, self.index_type, ctypes.c_void_p(offset)
             )
         else:
             logger.error("MultiBufferIndexVAO is not bound or not allocated")
 
+    def draw_instanced(self, instance_count, start_index=0, amount=-1):
+        """
+        Draw the indexed range instance_count times in one call.
+
+        Replaces a loop of identical draw calls with a single
+        glDrawElementsInstanced submission; the shader distinguishes
+        instances via gl_InstanceID or a per-instance attribute set up
+        with glVertexAttribDivisor.
+        """
+        if self.bound and self.allocated:
+            if amount == -1:
+                count = self.indices_count - start_index
+            else:
+                count = amount
+
+            if count <= 0 or instance_count <= 0:
+                return
+            offset = start_index * self._index_stride
+            gl.glDrawElementsInstanced(
+                self.mode,
+                count,
+                self.index_type,
+                ctypes.c_void_p(offset),
+                instance_count,
+            )
+        else:
+            logger.error("MultiBufferIndexVAO is not bound or not allocated")
+
     def set_data(self, data, index=None):
         if not isinstance(data, VertexData):
             logger.error(
@@ -51,49 +120,134 @@ class MultiBufferIndexVAO(AbstractVAO):
             index = len(self.vbo_ids)
 
         if index >= len(self.vbo_ids):
-            new_buffers = index - len(self.vbo_ids) + 1
-            new_ids = gl.glGenBuffers(new_buffers)
-            if isinstance(new_ids, np.ndarray):
-                self.vbo_ids.extend(new_ids)
-            else:
-                self.vbo_ids.append(new_ids)
+            for new_index in range(len(self.vbo_ids), index + 1):
+                new_ids = gl.glGenBuffers(self.ring_size)
+                if isinstance(new_ids, np.ndarray):
+                    ring = list(new_ids)
+                else:
+                    ring = [new_ids]
+                self.vbo_rings[new_index] = ring
+                self.ring_pos[new_index] = 0
+                self.vbo_ids.append(ring[0])
+
+        # Advance the ring so this upload lands in a buffer the GPU is no
+        # longer reading from
+        if self.ring_size > 1:
+            slot = (self.ring_pos[index] + 1) % self.ring_size
+            self.ring_pos[index] = slot
+            self.vbo_ids[index] = self.vbo_rings[index][slot]
+        else:
+            slot = 0
 
-        if isinstance(data.data, list):
-            vertex_array = np.array(data.data, dtype=np.float32)
+        # ascontiguousarray is a no-op for contiguous typed input, so callers
+        # that already hold a float32 (or packed integer) ndarray upload with
+        # no copy at all; lists and buffers still convert to float32.
+        if isinstance(data.data, np.ndarray):
+            vertex_array = np.ascontiguousarray(data.data)
         else:
-            vertex_array = data.data
+            vertex_array = np.ascontiguousarray(data.data, dtype=np.float32)
 
         gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.vbo_ids[index])
-        gl.glBufferData(
-            gl.GL_ARRAY_BUFFER, vertex_array.nbytes, vertex_array, data.mode
-        )
+        # Refill in place while the data fits; glBufferData reallocates the
+        # store every call, which stalls on any in-flight GPU reads, so it is
+        # only used when the buffer actually has to grow.
+        if vertex_array.nbytes <= self.vbo_capacity.get((index, slot), 0):
+            gl.glBufferSubData(gl.GL_ARRAY_BUFFER, 0, vertex_array.nbytes, vertex_array)
+        else:
+            gl.glBufferData(
+                gl.GL_ARRAY_BUFFER, vertex_array.nbytes, vertex_array, data.mode
+            )
+            self.vbo_capacity[(index, slot)] = vertex_array.nbytes
         self.allocated = True
 
-    def set_indices(
-        self, data, index_type=gl.GL_UNSIGNED_SHORT, mode=gl.GL_STATIC_DRAW
+    def set_vertex_attribute_pointer(
+        self, index, size, type, stride, offset, normalized=False
     ):
-        if not isinstance(data, list):
-            logger.error("MultiBufferIndexVAO.set_indices: data must be of type List")
-            raise TypeError("data must be of type List")
+        """
+        Describe a vertex attribute on the currently bound array buffer.
 
+        Overrides the base helper to expose glVertexAttribPointer's
+        normalized flag, which integer formats need when the shader should
+        read them as [0,1] floats (e.g. unsigned-byte colours).
+        """
+        if not self.bound:
+            logger.error("Trying to set attribute pointer when unbound")
+            return
+        gl.glVertexAttribPointer(
+            index,
+            size,
+            type,
+            gl.GL_TRUE if normalized else gl.GL_FALSE,
+            stride,
+            ctypes.c_void_p(offset),
+        )
+        gl.glEnableVertexAttribArray(index)
+
+    def set_data_batch(self, data_list):
+        """
+        Upload several vertex buffers in one call.
+
+        All the VBOs (including ring entries) are created with a single
+        glGenBuffers allocation instead of one driver call per buffer,
+        then each VertexData uploads through set_data. The buffers land
+        at consecutive indices after any that already exist.
+        """
         if not self.bound:
             logger.error("Trying to set VOA data when unbound")
             return
+        if not data_list:
+            return
+
+        start = len(self.vbo_ids)
+        new_ids = gl.glGenBuffers(len(data_list) * self.ring_size)
+        if isinstance(new_ids, np.ndarray):
+            ids = list(new_ids)
+        else:
+            ids = [new_ids]
+        for k in range(len(data_list)):
+            ring = ids[k * self.ring_size : (k + 1) * self.ring_size]
+            index = start + k
+            self.vbo_rings[index] = ring
+            self.ring_pos[index] = 0
+            self.vbo_ids.append(ring[0])
+        for k, data in enumerate(data_list):
+            self.set_data(data, start + k)
 
+    def _ensure_index_buffer(self):
+        """
+        Create the element buffer on first use and memoise its id.
+        """
         if self.index_buffer_id == 0:
             self.index_buffer_id = gl.glGenBuffers(1)
+        return self.index_buffer_id
 
-        self.index_type = index_type
-        self.indices_count = len(data)
-        if index_type == gl.GL_UNSIGNED_INT:
-            index_array = np.array(data, dtype=np.uint32)
-        elif index_type == gl.GL_UNSIGNED_SHORT:
-            index_array = np.array(data, dtype=np.uint16)
-        elif index_type == gl.GL_UNSIGNED_BYTE:
-            index_array = np.array(data, dtype=np.uint8)
-        else:
+    def set_indices(
+        self, data, index_type=gl.GL_UNSIGNED_SHORT, mode=gl.GL_STATIC_DRAW
+    ):
+        if not isinstance(data, (list, np.ndarray)):
+            logger.error(
+                "MultiBufferIndexVAO.set_indices: data must be a list or ndarray"
+            )
+            raise TypeError("data must be a list or ndarray")
+
+        if not self.bound:
+            logger.error("Trying to set VOA data when unbound")
+            return
+
+        dtype = _INDEX_DTYPES.get(index_type)
+        if dtype is None:
             logger.error("Unsupported index type")
             return
+
+        self._ensure_index_buffer()
+
+        self.index_type = index_type
+        self._index_stride = np.dtype(dtype).itemsize
+        self.indices_count = len(data)
+        # No-op for a contiguous ndarray that already has the right dtype,
+        # so typed callers upload without a conversion pass; lists still
+        # convert as before
+        index_array = np.ascontiguousarray(data, dtype=dtype)
         gl.glBindBuffer(gl.GL_ELEMENT_ARRAY_BUFFER, self.index_buffer_id)
         gl.glBufferData(
             gl.GL_ELEMENT_ARRAY_BUFFER, index_array.nbytes, index_array, mode
@@ -103,11 +257,25 @@ class MultiBufferIndexVAO(AbstractVAO):
         if self.bound:
             self.unbind()
         if self.allocated:
+            # Hand glDeleteBuffers typed arrays so PyOpenGL passes them
+            # straight through instead of converting the id lists itself
             if self.vbo_ids:
-                gl.glDeleteBuffers(len(self.vbo_ids), self.vbo_ids)
+                all_ids = np.fromiter(
+                    (bid for ring in self.vbo_rings.values() for bid in ring),
+                    dtype=np.uint32,
+                )
+                gl.glDeleteBuffers(len(all_ids), all_ids)
             if self.index_buffer_id != 0:
-                gl.glDeleteBuffers(1, [self.index_buffer_id])
+                gl.glDeleteBuffers(
+                    1, np.asarray([self.index_buffer_id], dtype=np.uint32)
+                )
 
+        # Drop the cached binding if it points at the id being deleted;
+        # a future VAO could be handed the same id
+        global _bound_vao_id
+        if _bound_vao_id == self.id:
+            gl.glBindVertexArray(0)
+            _bound_vao_id = 0
         gl.glDeleteVertexArrays(1, [self.id])
         self.allocated = False
 
@@ -116,8 +284,120 @@ class MultiBufferIndexVAO(AbstractVAO):
             return self.vbo_ids[index]
         return 0
 
+    def allocate_persistent(self, index, nbytes, slots=1):
+        """
+        Allocate an immutable store for a buffer index and map it once with
+        write/persistent/coherent access. Later updates go through
+        update_persistent, which is a plain memcpy with no GL call at all.
+
+        slots > 1 sizes the store for that many nbytes-sized ranges which
+        update_persistent cycles through, each guarded by a fence: the CPU
+        writes one half while the GPU reads the other, so streaming never
+        stalls on an in-flight draw. Callers draw from the byte offset that
+        update_persistent returns and call fence_persistent after the draw.
+
+        Needs GL_ARB_buffer_storage (core in GL 4.4). Returns True when the
+        persistent mapping is in place; on contexts without the extension
+        nothing is allocated and callers should keep using set_data, which
+        already reuses its storage.
+        """
+        if not self.bound:
+            logger.error("Trying to allocate VAO storage when unbound")
+            return False
+        if not bool(gl.glBufferStorage):
+            logger.info("GL_ARB_buffer_storage not available")
+            return False
+
+        if index >= len(self.vbo_ids):
+            # A persistently mapped buffer is never ring-cycled through
+            # separate VBOs (its ranges cycle instead), so each new index
+            # gets a single-entry ring
+            for new_index in range(len(self.vbo_ids), index + 1):
+                new_id = gl.glGenBuffers(1)
+                self.vbo_rings[new_index] = [new_id]
+                self.ring_pos[new_index] = 0
+                self.vbo_ids.append(new_id)
+
+        slots = max(1, slots)
+        total = nbytes * slots
+        flags = gl.GL_MAP_WRITE_BIT | gl.GL_MAP_PERSISTENT_BIT | gl.GL_MAP_COHERENT_BIT
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.vbo_ids[index])
+        gl.glBufferStorage(gl.GL_ARRAY_BUFFER, total, None, flags)
+        ptr = gl.glMapBufferRange(gl.GL_ARRAY_BUFFER, 0, total, flags)
+        if not isinstance(ptr, int):
+            ptr = ctypes.cast(ptr, ctypes.c_void_p).value
+        self.persistent_ptrs[index] = (ptr, nbytes, slots)
+        self.persistent_state[index] = {"pos": 0, "fences": [None] * slots}
+        self.vbo_capacity[(index, 0)] = total
+        self.allocated = True
+        return True
+
+    def update_persistent(self, index, data):
+        """
+        Copy a contiguous float32 ndarray into a persistently mapped buffer
+        and return the byte offset of the range written. The mapping is
+        coherent, so the write is visible to the GPU without a flush.
+
+        With a multi-slot allocation the write goes to the next range in
+        the cycle, first waiting on (and clearing) any fence left there by
+        fence_persistent — by the time a slot comes round again its draw
+        has normally retired, so the wait is usually free.
+        """
+        entry = self.persistent_ptrs.get(index)
+        if entry is None:
+            logger.error(f"Buffer {index} has no persistent mapping")
+            return None
+        base, slot_bytes, slots = entry
+        state = self.persistent_state[index]
+        slot = (state["pos"] + 1) % slots if slots > 1 else 0
+        fence = state["fences"][slot]
+        if fence is not None:
+            gl.glClientWaitSync(fence, gl.GL_SYNC_FLUSH_COMMANDS_BIT, int(1e9))
+            gl.glDeleteSync(fence)
+            state["fences"][slot] = None
+        offset = slot * slot_bytes
+        ctypes.memmove(base + offset, data.ctypes.data, min(data.nbytes, slot_bytes))
+        state["pos"] = slot
+        return offset
+
+    def fence_persistent(self, index):
+        """
+        Drop a fence after drawing from the current persistent range so the
+        next pass over this slot knows when the GPU has finished with it.
+        """
+        state = self.persistent_state.get(index)
+        if state is None:
+            logger.error(f"Buffer {index} has no persistent mapping")
+            return
+        state["fences"][state["pos"]] = gl.glFenceSync(
+            gl.GL_SYNC_GPU_COMMANDS_COMPLETE, 0
+        )
+
     def map_buffer(self, index=0, access_mode=gl.GL_READ_WRITE):
         if index < len(self.vbo_ids):
             gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.vbo_ids[index])
             return gl.glMapBuffer(gl.GL_ARRAY_BUFFER, access_mode)
         return None
+
+    def map_buffer_range(
+        self,
+        index,
+        offset,
+        length,
+        access=gl.GL_MAP_WRITE_BIT
+        | gl.GL_MAP_INVALIDATE_BUFFER_BIT
+        | gl.GL_MAP_UNSYNCHRONIZED_BIT,
+    ):
+        """
+        Map part of a buffer for write-only streaming.
+
+        Unlike map_buffer's glMapBuffer(GL_READ_WRITE), the default access
+        flags tell the driver the old contents are disposable and that it
+        need not wait on pending GPU reads, so it can hand back fresh
+        memory immediately. Callers write through the pointer and then
+        call glUnmapBuffer(GL_ARRAY_BUFFER).
+        """
+        if index < len(self.vbo_ids):
+            gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.vbo_ids[index])
+            return gl.glMapBufferRange(gl.GL_ARRAY_BUFFER, offset, length, access)
+        return None
@@ -7,9 +7,12 @@ The vertex data changes over time, showing how to update a Vertex Array Object (
 User input allows for interactive rotation, translation, and zoom.
 """
 
+import functools
 import logging
+import math
 import sys
 
+import numpy as np
 import OpenGL.GL as gl
 from MultiBufferIndexVAO import MultiBufferIndexVAO, VertexData
 from ngl import (
@@ -19,7 +22,6 @@ from ngl import (
     Transform,
     VAOFactory,
     Vec3,
-    Vec3Array,
     look_at,
     perspective,
 )
@@ -29,6 +31,56 @@ from PySide6.QtWidgets import QApplication
 
 COLOUR_SHADER = "ColourShader"
 
+# Interleaved icosahedron vertex: float32 position plus normalized
+# unsigned-byte colour. One 16-byte record per vertex gives a single
+# fetch stream, and the whole 12-vertex mesh fits in 192 bytes (one pad
+# byte keeps the stride 4-byte aligned).
+ICO_VERTEX_DTYPE = np.dtype(
+    {
+        "names": ["pos", "colour"],
+        "formats": [("<f4", (3,)), ("u1", (3,))],
+        "offsets": [0, 12],
+        "itemsize": 16,
+    }
+)
+
+
+def _rotate_yx(x_deg: float, y_deg: float) -> Mat4:
+    """
+    Build rotate_y(y_deg) @ rotate_x(x_deg) directly from its closed form.
+
+    Writing the product's nine entries from four sin/cos evaluations avoids
+    the two intermediate Mat4 allocations and the 4x4 multiply that
+    `Mat4().rotate_y(...) @ Mat4().rotate_x(...)` costs per update.
+    """
+    x = math.radians(x_deg)
+    y = math.radians(y_deg)
+    cx, sx = math.cos(x), math.sin(x)
+    cy, sy = math.cos(y), math.sin(y)
+    m = Mat4()
+    m[0][0] = cy
+    m[0][2] = -sy
+    m[1][0] = sy * sx
+    m[1][1] = cx
+    m[1][2] = cy * sx
+    m[2][0] = sy * cx
+    m[2][1] = -sx
+    m[2][2] = cy * cx
+    return m
+
+
+@functools.lru_cache(maxsize=4096)
+def _compose_rot(spin_x: float, spin_y: float) -> Mat4:
+    """
+    Memoised rotation for a (spin x, spin y) pair.
+
+    The spin angles move in whole-degree steps, so the same pair recurs
+    whenever the user pauses or retraces a drag; repeats skip the trig
+    entirely. Callers overwrite the translation column of the returned
+    matrix, which is safe because every caller rewrites it before use.
+    """
+    return _rotate_yx(spin_x, spin_y)
+
 
 class MainWindow(PySideEventHandlingMixin, QOpenGLWindow):
     """
@@ -56,12 +108,33 @@ class MainWindow(PySideEventHandlingMixin, QOpenGLWindow):
         self.project: Mat4 = Mat4()  # Projection matrix
         self.data: list[float] = []  # Dynamic vertex data
         self.index: int = 0
+        # The three icosahedron placements never move, so their translate
+        # matrices are built once; project @ view @ translate is refolded
+        # per resize, leaving one matmul per draw in paintGL
+        self._t_mats: list[Mat4] = []
+        for x in (-1.2, 0.0, 1.2):
+            t = Transform()
+            t.set_position(x, 0.0, 0.0)
+            self._t_mats.append(t.get_matrix())
+        self._pvt: list[Mat4] = []
+        # Current glPolygonMode, tracked so redundant switches are skipped
+        self._polygon_mode = gl.GL_FILL
+        # Last (spin, position) tuple whose MVPs were uploaded; while it
+        # is unchanged the UBO contents are still valid and the per-frame
+        # pack + glBufferSubData are skipped
+        self._last_transform = None
+        # Qt floods resize events during a live drag; the projection is
+        # rebuilt at most once per rendered frame from the latest size
+        self._pending_size = (self.window_width, self.window_height)
+        self._projected_size = None
 
     def initializeGL(self) -> None:
         """
         Set up OpenGL context, load shaders, and initialize scene.
+
+        The context is already current here and in paintGL — Qt guarantees
+        that — so there is no makeCurrent call on either path.
         """
-        self.makeCurrent()
         gl.glClearColor(0.4, 0.4, 0.4, 1.0)  # Set background color
         gl.glEnable(gl.GL_DEPTH_TEST)  # Enable depth testing
         gl.glEnable(gl.GL_MULTISAMPLE)  # Enable anti-aliasing
@@ -77,106 +150,180 @@ class MainWindow(PySideEventHandlingMixin, QOpenGLWindow):
             logging.error("Error loading shaders")
             self.close()
         ShaderLib.use(COLOUR_SHADER)
+        # The three per-frame MVPs live in one uniform buffer: a single
+        # glBufferSubData refreshes all of them and glBindBufferRange
+        # selects each draw's slot. Slots are padded from 64 bytes up to
+        # the driver's UBO offset alignment. GLSL 410 has no binding
+        # layout qualifier, so the block is wired to binding 0 from here.
+        program = gl.glGetIntegerv(gl.GL_CURRENT_PROGRAM)
+        block_index = gl.glGetUniformBlockIndex(program, "MVPBlock")
+        gl.glUniformBlockBinding(program, block_index, 0)
+        align = int(gl.glGetIntegerv(gl.GL_UNIFORM_BUFFER_OFFSET_ALIGNMENT))
+        self._ubo_stride = ((64 + align - 1) // align) * align
+        self._mvp_block = np.zeros(3 * self._ubo_stride // 4, dtype=np.float32)
+        self._mvp_ubo = gl.glGenBuffers(1)
+        gl.glBindBuffer(gl.GL_UNIFORM_BUFFER, self._mvp_ubo)
+        gl.glBufferData(
+            gl.GL_UNIFORM_BUFFER, self._mvp_block.nbytes, None, gl.GL_DYNAMIC_DRAW
+        )
 
         # Set up camera/view matrix
         self.view = look_at(Vec3(0, 1, 3), Vec3(0, 0, 0), Vec3(0, 1, 0))
         self.project = perspective(45.0, 1024.0 / 720.0, 0.001, 500.0)
+        self._update_projection_products()
         self.build_vao()
 
         # Start a timer to update the vertex data periodically
         self.startTimer(160)
 
     def build_vao(self):
+        # The geometry is a fixed 12-vertex icosahedron, so the buffers are
+        # typed numpy literals that upload without any per-element boxing
         # fmt: off
-        verts = Vec3Array([
-            Vec3(-0.26286500 , 0.0000000 , 0.42532500 ),
-            Vec3(0.26286500 , 0.0000000 , 0.42532500 ),
-            Vec3(-0.26286500 , 0.0000000 , -0.42532500 ),
-            Vec3(0.26286500 , 0.0000000 , -0.42532500 ),
-            Vec3(0.0000000 , 0.42532500 , 0.26286500 ),
-            Vec3(0.0000000 , 0.42532500 , -0.26286500 ),
-            Vec3(0.0000000 , -0.42532500 , 0.26286500 ),
-            Vec3(0.0000000 , -0.42532500 , -0.26286500 ),
-            Vec3(0.42532500 , 0.26286500 , 0.0000000 ),
-            Vec3(-0.42532500 , 0.26286500 , 0.0000000 ),
-            Vec3(0.42532500 , -0.26286500 , 0.0000000 ),
-            Vec3(-0.42532500 , -0.26286500 , 0.0000000 )
-        ])
-
-        colours = Vec3Array([
-            Vec3(1.0, 0.0, 0.0),
-            Vec3(1.0, 0.55, 0.0),
-            Vec3(1.0, 0.0, 1.0),
-            Vec3(0.0, 1.0, 0.0),
-            Vec3(0.0, 0.0, 1.0),
-            Vec3(0.29, 0.51, 0.0),
-            Vec3(0.5, 0.0, 0.5),
-            Vec3(1.0, 1.0, 1.0),
-            Vec3(0.0, 1.0, 1.0),
-            Vec3(0.0, 0.0, 0.0),
-            Vec3(0.12, 0.56, 1.0),
-            Vec3(0.86, 0.08, 0.24),
-        ])
-
-        indices = [
+        verts = np.array([
+            [-0.26286500, 0.0000000, 0.42532500],
+            [0.26286500, 0.0000000, 0.42532500],
+            [-0.26286500, 0.0000000, -0.42532500],
+            [0.26286500, 0.0000000, -0.42532500],
+            [0.0000000, 0.42532500, 0.26286500],
+            [0.0000000, 0.42532500, -0.26286500],
+            [0.0000000, -0.42532500, 0.26286500],
+            [0.0000000, -0.42532500, -0.26286500],
+            [0.42532500, 0.26286500, 0.0000000],
+            [-0.42532500, 0.26286500, 0.0000000],
+            [0.42532500, -0.26286500, 0.0000000],
+            [-0.42532500, -0.26286500, 0.0000000],
+        ], dtype=np.float32)
+
+        # Colours are stored normalized unsigned-byte — 3 bytes per vertex
+        # instead of 12; GL rescales to [0,1] on fetch so the shader is
+        # unchanged
+        colours = np.round(np.array([
+            [1.0, 0.0, 0.0],
+            [1.0, 0.55, 0.0],
+            [1.0, 0.0, 1.0],
+            [0.0, 1.0, 0.0],
+            [0.0, 0.0, 1.0],
+            [0.29, 0.51, 0.0],
+            [0.5, 0.0, 0.5],
+            [1.0, 1.0, 1.0],
+            [0.0, 1.0, 1.0],
+            [0.0, 0.0, 0.0],
+            [0.12, 0.56, 1.0],
+            [0.86, 0.08, 0.24],
+        ]) * 255.0).astype(np.uint8)
+
+        # All indices are < 12, so unsigned bytes halve the index buffer
+        # to 60 bytes
+        indices = np.array([
             0, 6, 1, 0, 11, 6, 1, 4, 0, 1, 8, 4, 1, 10, 8, 2, 5, 3, 2, 9, 5, 2, 11, 9, 3, 7, 2, 3, 10, 7,
             4, 8, 5, 4, 9, 0, 5, 8, 3, 5, 9, 4, 6, 10, 1, 6, 11, 7, 7, 10, 6, 7, 11, 2, 8, 10, 3, 9, 11, 0,
-        ]
+        ], dtype=np.uint8)
 
         self.num_indices = len(indices)
         # fmt: on
         self.vao = VAOFactory.create_vao("MultiBufferIndexVAO", gl.GL_TRIANGLES)
 
+        # Positions and colours interleave into one static VBO, so vertex
+        # assembly reads a single 16-byte stream instead of two buffers;
+        # zeros keeps the pad byte per vertex deterministic
+        buf = np.zeros(len(verts), dtype=ICO_VERTEX_DTYPE)
+        buf["pos"] = verts
+        buf["colour"] = colours
+        stride = ICO_VERTEX_DTYPE.itemsize
+
         with self.vao:
-            # As this is a Multi buffer VAO we can add two initial buffer one for Vertex and one for Color
-            data = VertexData(data=verts.to_list(), size=len(verts))
+            data = VertexData(
+                data=buf.ravel().view(np.float32),
+                size=len(verts),
+                mode=gl.GL_STATIC_DRAW,
+            )
             self.vao.set_data(data)
-            self.vao.set_vertex_attribute_pointer(0, 3, gl.GL_FLOAT, 0, 0)
-
-            colour_data = VertexData(data=colours.to_list(), size=len(colours))
-            self.vao.set_data(colour_data)
-            self.vao.set_vertex_attribute_pointer(1, 3, gl.GL_FLOAT, 0, 0)
+            self.vao.set_vertex_attribute_pointer(0, 3, gl.GL_FLOAT, stride, 0)
+            self.vao.set_vertex_attribute_pointer(
+                1, 3, gl.GL_UNSIGNED_BYTE, stride, 12, normalized=True
+            )
 
-            self.vao.set_indices(indices, gl.GL_UNSIGNED_SHORT)
+            self.vao.set_indices(indices, gl.GL_UNSIGNED_BYTE)
             self.vao.set_num_indices(len(indices))
 
     def paintGL(self) -> None:
         """
         Render the scene. Called automatically by Qt.
         """
-        self.makeCurrent()
         gl.glViewport(0, 0, self.window_width, self.window_height)
         gl.glClear(gl.GL_COLOR_BUFFER_BIT | gl.GL_DEPTH_BUFFER_BIT)
+        if self._pending_size != self._projected_size:
+            w, h = self._pending_size
+            self.project = perspective(45.0, float(w) / h, 0.05, 350.0)
+            self._update_projection_products()
+            self._projected_size = self._pending_size
+            self._last_transform = None
         ShaderLib.use(COLOUR_SHADER)
 
-        # Apply rotation based on user input
-        rot_x = Mat4().rotate_x(self.spin_x_face)
-        rot_y = Mat4().rotate_y(self.spin_y_face)
-        mouse_global_tx = rot_y @ rot_x
+        # Refresh the UBO only when the view actually moved; timer-driven
+        # repaints between inputs reuse the uploaded MVPs. The draws below
+        # always run — Qt expects a full repaint of the backbuffer.
+        transform = (
+            self.spin_x_face,
+            self.spin_y_face,
+            self.model_position.x,
+            self.model_position.y,
+            self.model_position.z,
+        )
+        if transform != self._last_transform:
+            self._last_transform = transform
+            # Apply rotation based on user input
+            mouse_global_tx = _compose_rot(self.spin_x_face, self.spin_y_face)
+
+            # Update model position
+            mouse_global_tx[3][0] = self.model_position.x
+            mouse_global_tx[3][1] = self.model_position.y
+            mouse_global_tx[3][2] = self.model_position.z
 
-        # Update model position
-        mouse_global_tx[3][0] = self.model_position.x
-        mouse_global_tx[3][1] = self.model_position.y
-        mouse_global_tx[3][2] = self.model_position.z
+            # One buffer update covers all three MVPs; each draw then just
+            # rebinds its 64-byte slot
+            stride_f = self._ubo_stride // 4
+            for k in range(3):
+                mvp = self._pvt[k] @ mouse_global_tx
+                self._mvp_block[k * stride_f : k * stride_f + 16] = mvp.to_list()
+            gl.glBindBuffer(gl.GL_UNIFORM_BUFFER, self._mvp_ubo)
+            gl.glBufferSubData(
+                gl.GL_UNIFORM_BUFFER, 0, self._mvp_block.nbytes, self._mvp_block
+            )
 
         with self.vao:
-            t = Transform()
-            t.set_position(-1.2, 0.0, 0.0)
-            mvp = self.project @ self.view @ t.get_matrix() @ mouse_global_tx
-            ShaderLib.set_uniform("MVP", mvp)
+            # project @ view @ translate is pre-folded per placement, so
+            # each draw costs one matmul instead of four. All the filled
+            # draws run first and the wireframe overlay last, so the frame
+            # needs two polygon-mode switches instead of three; the mode is
+            # left on GL_LINE and corrected lazily next frame.
+            self._set_polygon_mode(gl.GL_FILL)
+            self._bind_mvp_slot(0)
             self.vao.draw(0, self.index * 3)
-            t.set_position(0.0, 0.0, 0.0)
-            mvp = self.project @ self.view @ t.get_matrix() @ mouse_global_tx
-            ShaderLib.set_uniform("MVP", mvp)
-            gl.glPolygonMode(gl.GL_FRONT_AND_BACK, gl.GL_FILL)
+            self._bind_mvp_slot(1)
             self.vao.draw()
-            t.set_position(1.2, 0.0, 0.0)
-            mvp = self.project @ self.view @ t.get_matrix() @ mouse_global_tx
-            ShaderLib.set_uniform("MVP", mvp)
+            self._bind_mvp_slot(2)
             self.vao.draw(self.index * 3, 3)
-            gl.glPolygonMode(gl.GL_FRONT_AND_BACK, gl.GL_LINE)
+            self._set_polygon_mode(gl.GL_LINE)
+            # the wireframe overlay reuses slot 2, which is still bound
             self.vao.draw()
-            gl.glPolygonMode(gl.GL_FRONT_AND_BACK, gl.GL_FILL)
+
+    def _bind_mvp_slot(self, k: int) -> None:
+        """
+        Point the MVPBlock binding at slot k of the uniform buffer.
+        """
+        gl.glBindBufferRange(
+            gl.GL_UNIFORM_BUFFER, 0, self._mvp_ubo, k * self._ubo_stride, 64
+        )
+
+    def _set_polygon_mode(self, mode) -> None:
+        """
+        Switch the front-and-back polygon mode only when it changes.
+        """
+        if mode != self._polygon_mode:
+            gl.glPolygonMode(gl.GL_FRONT_AND_BACK, mode)
+            self._polygon_mode = mode
 
     def resizeGL(self, w: int, h: int) -> None:
         """
@@ -188,7 +335,17 @@ class MainWindow(PySideEventHandlingMixin, QOpenGLWindow):
         """
         self.window_width = int(w * self.devicePixelRatio())
         self.window_height = int(h * self.devicePixelRatio())
-        self.project = perspective(45.0, float(w) / h, 0.05, 350.0)
+        self._pending_size = (w, h)
+
+    def _update_projection_products(self) -> None:
+        """
+        Refold project @ view @ translate for the three placements.
+
+        Only needed when the projection or view changes (init and resize);
+        paintGL then finishes each MVP with a single multiply.
+        """
+        pv = self.project @ self.view
+        self._pvt = [pv @ t for t in self._t_mats]
 
     def timerEvent(self, event) -> None:
         """
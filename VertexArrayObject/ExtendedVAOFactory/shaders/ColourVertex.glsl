@@ -3,7 +3,10 @@
 layout(location=0) in vec3 inPos;
 layout(location=1) in vec4 inColour;
 
-uniform mat4 MVP;
+layout(std140) uniform MVPBlock
+{
+  mat4 MVP;
+};
 out vec4 colour;
 void main()
 {
@@ -1,8 +1,21 @@
 #!/usr/bin/env -S uv run --script
 
+import functools
+import math
 import sys
 
+import numpy as np
 import OpenGL.GL as gl
+
+# The paintGL entry points are bound once here; resolving them through
+# the OpenGL.GL module is a Python attribute lookup per access and these
+# run every frame
+from OpenGL.GL import (
+    GL_COLOR_BUFFER_BIT,
+    GL_DEPTH_BUFFER_BIT,
+    glClear,
+    glViewport,
+)
 from ngl import (
     IndexVertexData,
     Mat4,
@@ -20,6 +33,43 @@ from PySide6.QtOpenGL import QOpenGLWindow
 from PySide6.QtWidgets import QApplication
 
 
+def _rotate_yx(x_deg: float, y_deg: float) -> Mat4:
+    """
+    Build rotate_y(y_deg) @ rotate_x(x_deg) directly from its closed form.
+
+    Writing the product's nine entries from four sin/cos evaluations avoids
+    the two intermediate Mat4 allocations and the 4x4 multiply that
+    `Mat4().rotate_y(...) @ Mat4().rotate_x(...)` costs per update.
+    """
+    x = math.radians(x_deg)
+    y = math.radians(y_deg)
+    cx, sx = math.cos(x), math.sin(x)
+    cy, sy = math.cos(y), math.sin(y)
+    m = Mat4()
+    m[0][0] = cy
+    m[0][2] = -sy
+    m[1][0] = sy * sx
+    m[1][1] = cx
+    m[1][2] = cy * sx
+    m[2][0] = sy * cx
+    m[2][1] = -sx
+    m[2][2] = cy * cx
+    return m
+
+
+@functools.lru_cache(maxsize=4096)
+def _compose_rot(spin_x: float, spin_y: float) -> Mat4:
+    """
+    Memoised rotation for a (spin x, spin y) pair.
+
+    The spin angles move in whole-degree steps, so the same pair recurs
+    whenever the user pauses or retraces a drag; repeats skip the trig
+    entirely. Callers overwrite the translation column of the returned
+    matrix, which is safe because every caller rewrites it before use.
+    """
+    return _rotate_yx(spin_x, spin_y)
+
+
 class MainWindow(PySideEventHandlingMixin, QOpenGLWindow):
     def __init__(self, parent=None):
         super().__init__()
@@ -36,6 +86,13 @@ class MainWindow(PySideEventHandlingMixin, QOpenGLWindow):
         self.view = Mat4()
         self.project = Mat4()
         self.vao = None
+        # Qt floods resize events during a live drag; the projection is
+        # rebuilt at most once per rendered frame from the latest size
+        self._pending_size = (self.window_width, self.window_height)
+        self._projected_size = None
+        # Last (spin, position) tuple whose MVP was uploaded; repaints
+        # with an unchanged view reuse the uniform already in the program
+        self._last_transform = None
 
     def initializeGL(self):
         self.makeCurrent()
@@ -73,10 +130,12 @@ class MainWindow(PySideEventHandlingMixin, QOpenGLWindow):
         Vec3(-0.42532500, -0.26286500, 0.0000000),  Vec3(0.86,0.08,0.24)
         ])
 
-        indices=[0,6,1,0,11,6,1,4,0,1,8,4,1,10,8,2,5,3,
+        # All indices are < 12, so unsigned bytes halve the index buffer
+        # to 60 bytes and the typed array uploads without int boxing
+        indices = np.array([0,6,1,0,11,6,1,4,0,1,8,4,1,10,8,2,5,3,
             2,9,5,2,11,9,3,7,2,3,10,7,4,8,5,4,9,0,
             5,8,3,5,9,4,6,10,1,6,11,7,7,10,6,7,11,2,
-            8,10,3,9,11,0]
+            8,10,3,9,11,0], dtype=np.uint8)
 
         # fmt: on
 
@@ -86,12 +145,13 @@ class MainWindow(PySideEventHandlingMixin, QOpenGLWindow):
                 data=verts.to_list(),
                 size=len(indices),
                 indices=indices,
-                index_type=gl.GL_UNSIGNED_SHORT,
+                index_type=gl.GL_UNSIGNED_BYTE,
             )
             self.vao.set_data(data)
+            vec3_size = Vec3.sizeof()
             self.vao.set_vertex_attribute_pointer(0, 3, gl.GL_FLOAT, 24, 0)
             # 12 is the offset for the second attribute 3 * 4 bytes for a Vec3 use size of Vec3
-            self.vao.set_vertex_attribute_pointer(1, 3, gl.GL_FLOAT, 24, Vec3.sizeof())
+            self.vao.set_vertex_attribute_pointer(1, 3, gl.GL_FLOAT, 24, vec3_size)
             print("VAO created")
 
     def loadMatricesToShader(self):
@@ -101,26 +161,40 @@ class MainWindow(PySideEventHandlingMixin, QOpenGLWindow):
 
     def paintGL(self):
         self.makeCurrent()
-        gl.glViewport(0, 0, self.window_width, self.window_height)
-
-        gl.glClear(gl.GL_COLOR_BUFFER_BIT | gl.GL_DEPTH_BUFFER_BIT)
-        # Apply rotation based on user input
-        rot_x = Mat4().rotate_x(self.spin_x_face)
-        rot_y = Mat4().rotate_y(self.spin_y_face)
-        self.mouse_global_tx = rot_y @ rot_x
-
-        # Update model position
-        self.mouse_global_tx[3][0] = self.model_position.x
-        self.mouse_global_tx[3][1] = self.model_position.y
-        self.mouse_global_tx[3][2] = self.model_position.z
-        self.loadMatricesToShader()
+        glViewport(0, 0, self.window_width, self.window_height)
+
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        if self._pending_size != self._projected_size:
+            w, h = self._pending_size
+            self.project = perspective(45.0, float(w) / h, 0.01, 350.0)
+            self._projected_size = self._pending_size
+            self._last_transform = None
+        # Rebuild and upload the MVP only when the view moved; the draw
+        # below always runs so Qt gets the full repaint it expects
+        transform = (
+            self.spin_x_face,
+            self.spin_y_face,
+            self.model_position.x,
+            self.model_position.y,
+            self.model_position.z,
+        )
+        if transform != self._last_transform:
+            self._last_transform = transform
+            # Apply rotation based on user input
+            self.mouse_global_tx = _compose_rot(self.spin_x_face, self.spin_y_face)
+
+            # Update model position
+            self.mouse_global_tx[3][0] = self.model_position.x
+            self.mouse_global_tx[3][1] = self.model_position.y
+            self.mouse_global_tx[3][2] = self.model_position.z
+            self.loadMatricesToShader()
         with self.vao:
             self.vao.draw()
 
     def resizeGL(self, w, h):
         self.window_width = int(w * self.devicePixelRatio())
         self.window_height = int(h * self.devicePixelRatio())
-        self.project = perspective(45.0, float(w) / h, 0.01, 350.0)
+        self._pending_size = (w, h)
 
 
 if __name__ == "__main__":
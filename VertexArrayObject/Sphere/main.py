@@ -6,11 +6,15 @@ This script demonstrates how to use OpenGL and Qt to render a simple 3D object (
 It sets up a window, handles user input for rotation/translation/zoom, and manages OpenGL resources.
 """
 
+import concurrent.futures
+import functools
 import math
 import sys
 
+import numpy as np
 import OpenGL.GL as gl
 from ngl import (
+    IndexVertexData,
     Mat4,
     PySideEventHandlingMixin,
     ShaderLib,
@@ -18,7 +22,6 @@ from ngl import (
     VAOFactory,
     VAOType,
     Vec3,
-    VertexData,
     look_at,
     perspective,
 )
@@ -29,6 +32,57 @@ from PySide6.QtWidgets import QApplication
 TEXTURE_SHADER = "TextureShader"
 
 
+def _rotate_yx(x_deg: float, y_deg: float) -> Mat4:
+    """
+    Build rotate_y(y_deg) @ rotate_x(x_deg) directly from its closed form.
+
+    Writing the product's nine entries from four sin/cos evaluations avoids
+    the two intermediate Mat4 allocations and the 4x4 multiply that
+    `Mat4().rotate_y(...) @ Mat4().rotate_x(...)` costs per update.
+    """
+    x = math.radians(x_deg)
+    y = math.radians(y_deg)
+    cx, sx = math.cos(x), math.sin(x)
+    cy, sy = math.cos(y), math.sin(y)
+    m = Mat4()
+    m[0][0] = cy
+    m[0][2] = -sy
+    m[1][0] = sy * sx
+    m[1][1] = cx
+    m[1][2] = cy * sx
+    m[2][0] = sy * cx
+    m[2][1] = -sx
+    m[2][2] = cy * cx
+    return m
+
+
+@functools.lru_cache(maxsize=4096)
+def _compose_rot(spin_x: float, spin_y: float) -> Mat4:
+    """
+    Memoised rotation for a (spin x, spin y) pair.
+
+    The spin angles move in whole-degree steps, so the same pair recurs
+    whenever the user pauses or retraces a drag; repeats skip the trig
+    entirely. Callers overwrite the translation column of the returned
+    matrix, which is safe because every caller rewrites it before use.
+    """
+    return _rotate_yx(spin_x, spin_y)
+
+
+# Interleaved sphere vertex: float32 position, half-float normal and UV.
+# Normals are unit length and UVs sit in [0,1], well within half precision,
+# so the layout shrinks from 32 to 24 bytes per vertex (two pad bytes keep
+# the UV field 4-byte aligned).
+SPHERE_VERTEX_DTYPE = np.dtype(
+    {
+        "names": ["pos", "nrm", "uv"],
+        "formats": [("<f4", (3,)), ("<f2", (3,)), ("<f2", (2,))],
+        "offsets": [0, 12, 20],
+        "itemsize": 24,
+    }
+)
+
+
 class MainWindow(PySideEventHandlingMixin, QOpenGLWindow):
     """
 
@@ -52,6 +106,13 @@ class MainWindow(PySideEventHandlingMixin, QOpenGLWindow):
         self.setTitle("VAO Sphere with Texture")
         self.view: Mat4 = Mat4()  # View matrix
         self.project: Mat4 = Mat4()  # Projection matrix
+        # Qt floods resize events during a live drag; the projection is
+        # rebuilt at most once per rendered frame from the latest size
+        self._pending_size = (self.window_width, self.window_height)
+        self._projected_size = None
+        # Last (spin, position) tuple whose MVP was uploaded; repaints
+        # with an unchanged view reuse the uniform already in the program
+        self._last_transform = None
 
     def initializeGL(self) -> None:
         """
@@ -75,82 +136,118 @@ class MainWindow(PySideEventHandlingMixin, QOpenGLWindow):
             print("error loading shaders")
             self.close()
         ShaderLib.use(TEXTURE_SHADER)
-        texture = Texture("textures/earth.png")
-        self.texture_id = texture.set_texture_gl()
 
-        self.build_vao_sphere()
+        # Mesh generation is pure NumPy with no GL calls, so it runs on a
+        # worker thread while the main thread does the disk-bound texture
+        # load; only the upload below touches the GL context
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+            mesh = pool.submit(self._generate_sphere_mesh, 1.0, 100)
+            texture = Texture("textures/earth.png")
+            self.texture_id = texture.set_texture_gl()
+            vertex_data, indices = mesh.result()
 
-    def build_vao_sphere(self, radius: float = 1.0, precision: int = 100):
+        self.build_vao_sphere(vertex_data, indices)
+
+    @staticmethod
+    def _generate_sphere_mesh(radius: float = 1.0, precision: int = 100):
         """
-        Creates a sphere VAO using triangle strips.
+        Build the interleaved sphere vertices and triangle indices.
         based on an algorithm by Paul Bourke.
         http://astronomy.swin.edu.au/~pbourke/opengl/sphere/
 
+        Pure NumPy with no GL calls, so it is safe to run off the GL
+        thread.
+
         Args:
             radius: The radius of the sphere.
             precision: The number of divisions around the sphere. Higher is more detailed.
 
         Returns:
-            A configured ngl.AbstractVAO containing the sphere geometry.
+            A (vertex_data, indices) pair ready for IndexVertexData.
         """
-        # In NGL, "simpleVAO" is a basic VAO that holds interleaved data in a single buffer.
-        self.vao = VAOFactory.create_vao(VAOType.SIMPLE, gl.GL_TRIANGLE_STRIP)
-
+        # An indexed mesh over a unique (bands+1) x (precision+1) grid of
+        # vertices. The old triangle strip emitted every interior latitude
+        # ring twice (once as the top of one band, once as the bottom of
+        # the next); sharing the rows through an index buffer roughly
+        # halves the vertex count and lets the post-transform cache reuse
+        # shared vertices. The seam column and the pole rings keep their
+        # duplicates because their UVs differ per column.
         if radius < 0:
             radius = -radius
         if precision < 4:
             precision = 4
 
-        vertex_data = []
-
-        for i in range(precision // 2):
-            theta1 = i * (2 * math.pi) / precision - (math.pi / 2)
-            theta2 = (i + 1) * (2 * math.pi) / precision - (math.pi / 2)
-
-            for j in range(precision + 1):
-                theta3 = j * (2 * math.pi) / precision
-
-                # Vertex 1 (for the top of the strip)
-                nx1 = math.cos(theta2) * math.cos(theta3)
-                ny1 = math.sin(theta2)
-                nz1 = math.cos(theta2) * math.sin(theta3)
-                x1 = radius * nx1
-                y1 = radius * ny1
-                z1 = radius * nz1
-                u1 = j / precision
-                v1 = 1.0 - (2 * (i + 1) / precision)
-                vertex_data.extend([x1, y1, z1, nx1, ny1, nz1, u1, v1])
-
-                # Vertex 2 (for the bottom of the strip)
-                nx2 = math.cos(theta1) * math.cos(theta3)
-                ny2 = math.sin(theta1)
-                nz2 = math.cos(theta1) * math.sin(theta3)
-                x2 = radius * nx2
-                y2 = radius * ny2
-                z2 = radius * nz2
-                u2 = j / precision
-                v2 = 1.0 - (2 * i / precision)
-                vertex_data.extend([x2, y2, z2, nx2, ny2, nz2, u2, v2])
-
-        num_verts = len(vertex_data) // 8
+        bands = precision // 2
+        rows = bands + 1
+        cols = precision + 1
+        step = (2.0 * math.pi) / precision
+        r = np.arange(rows)
+        j = np.arange(cols)
+        theta_r = r * step - (math.pi / 2)
+        theta3 = j * step
+        cr, sr = np.cos(theta_r), np.sin(theta_r)
+        c3, s3 = np.cos(theta3), np.sin(theta3)
+
+        # zeros rather than empty so the two pad bytes per vertex are
+        # deterministic
+        buf = np.zeros((rows, cols), dtype=SPHERE_VERTEX_DTYPE)
+        pos, nrm, uv = buf["pos"], buf["nrm"], buf["uv"]
+        nx = np.outer(cr, c3)
+        nz = np.outer(cr, s3)
+        pos[..., 0] = radius * nx
+        pos[..., 1] = (radius * sr)[:, None]
+        pos[..., 2] = radius * nz
+        nrm[..., 0] = nx
+        nrm[..., 1] = sr[:, None]
+        nrm[..., 2] = nz
+        uv[..., 0] = (j / precision)[None, :]
+        uv[..., 1] = (1.0 - 2.0 * r / precision)[:, None]
+
+        # Two triangles per grid cell; no face culling is enabled so the
+        # winding order is unconstrained
+        cell = np.arange(bands)[:, None] * cols + np.arange(precision)[None, :]
+        tris = np.empty((bands, precision, 6), dtype=np.uint16)
+        tris[:, :, 0] = cell
+        tris[:, :, 1] = cell + cols
+        tris[:, :, 2] = cell + 1
+        tris[:, :, 3] = cell + 1
+        tris[:, :, 4] = cell + cols
+        tris[:, :, 5] = cell + cols + 1
+        indices = tris.ravel()
+
+        # The upload path expects float32, so reinterpret the 24-byte
+        # records as six float32 words each; the half-float bit patterns
+        # pass through the copy untouched
+        vertex_data = buf.ravel().view(np.float32)
+        return vertex_data, indices
+
+    def build_vao_sphere(self, vertex_data, indices) -> None:
+        """
+        Upload a generated sphere mesh into a new VAO.
+
+        GL objects must be created on the GL thread, so this is the
+        context-side half of _generate_sphere_mesh.
+        """
+        self.vao = VAOFactory.create_vao(VAOType.SIMPLE_INDEX, gl.GL_TRIANGLES)
 
         with self.vao:
-            data = VertexData(data=vertex_data, size=len(vertex_data))
+            data = IndexVertexData(
+                data=vertex_data,
+                size=indices.size,
+                indices=indices,
+                index_type=gl.GL_UNSIGNED_SHORT,
+            )
             self.vao.set_data(data)
 
-            # Stride is 8 floats * 4 bytes/float = 32 bytes
-            stride = 8 * 4
+            stride = SPHERE_VERTEX_DTYPE.itemsize
 
             # Set attribute pointers for the interleaved data
-            # Attribute 0: Vertex (x, y, z)
+            # Attribute 0: Vertex (x, y, z) as float32
             self.vao.set_vertex_attribute_pointer(0, 3, gl.GL_FLOAT, stride, 0)
-            # Attribute 1: Normal (nx, ny, nz) - offset is 3 floats (12 bytes)
-            self.vao.set_vertex_attribute_pointer(1, 3, gl.GL_FLOAT, stride, 3 * 4)
-            # Attribute 2: UV (u, v) - offset is 6 floats (24 bytes)
-            self.vao.set_vertex_attribute_pointer(2, 2, gl.GL_FLOAT, stride, 6 * 4)
-
-            # Set the number of vertices to draw
-            self.vao.set_num_indices(num_verts)
+            # Attribute 1: Normal (nx, ny, nz) as half floats at byte 12
+            self.vao.set_vertex_attribute_pointer(1, 3, gl.GL_HALF_FLOAT, stride, 12)
+            # Attribute 2: UV (u, v) as half floats at byte 20
+            self.vao.set_vertex_attribute_pointer(2, 2, gl.GL_HALF_FLOAT, stride, 20)
 
     def loadMatricesToShader(self) -> None:
         """
@@ -166,19 +263,33 @@ class MainWindow(PySideEventHandlingMixin, QOpenGLWindow):
         self.makeCurrent()
         gl.glViewport(0, 0, self.window_width, self.window_height)
         gl.glClear(gl.GL_COLOR_BUFFER_BIT | gl.GL_DEPTH_BUFFER_BIT)
+        if self._pending_size != self._projected_size:
+            w, h = self._pending_size
+            self.project = perspective(45.0, float(w) / h, 0.1, 350.0)
+            self._projected_size = self._pending_size
+            self._last_transform = None
         ShaderLib.use(TEXTURE_SHADER)
 
-        # Apply rotation based on user input
-        rot_x = Mat4().rotate_x(self.spin_x_face)
-        rot_y = Mat4().rotate_y(self.spin_y_face)
-        self.mouse_global_tx = rot_y @ rot_x
+        # Rebuild and upload the MVP only when the view moved; the draw
+        # below always runs so Qt gets the full repaint it expects
+        transform = (
+            self.spin_x_face,
+            self.spin_y_face,
+            self.model_position.x,
+            self.model_position.y,
+            self.model_position.z,
+        )
+        if transform != self._last_transform:
+            self._last_transform = transform
+            # Apply rotation based on user input
+            self.mouse_global_tx = _compose_rot(self.spin_x_face, self.spin_y_face)
 
-        # Update model position
-        self.mouse_global_tx[3][0] = self.model_position.x
-        self.mouse_global_tx[3][1] = self.model_position.y
-        self.mouse_global_tx[3][2] = self.model_position.z
+            # Update model position
+            self.mouse_global_tx[3][0] = self.model_position.x
+            self.mouse_global_tx[3][1] = self.model_position.y
+            self.mouse_global_tx[3][2] = self.model_position.z
 
-        self.loadMatricesToShader()
+            self.loadMatricesToShader()
         # Draw geometry
         with self.vao:
             self.vao.draw()
@@ -194,7 +305,7 @@ class MainWindow(PySideEventHandlingMixin, QOpenGLWindow):
 
         self.window_width = int(w * self.devicePixelRatio())
         self.window_height = int(h * self.devicePixelRatio())
-        self.project = perspective(45.0, float(w) / h, 0.1, 350.0)
+        self._pending_size = (w, h)
 
 
 if __name__ == "__main__":